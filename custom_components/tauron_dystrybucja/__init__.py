@@ -3,31 +3,169 @@ from __future__ import annotations
 
 import logging
 
+import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryNotReady
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import ConfigEntryNotReady, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import dt as dt_util
 
-from .api import TauronApi, TauronApiError
+from .api import TauronApiError, async_get_api
+from .archive import async_get_archive
+from .capture import async_get_capture
 from .const import (
+    CONF_ADDRESSES,
     CONF_CITY_GAID,
     CONF_CITY_NAME,
     CONF_HOUSE_NO,
     CONF_STREET_GAID,
     CONF_STREET_NAME,
+    DEFAULT_CAPTURE_SIZE,
     DOMAIN,
+    MAX_CAPTURE_SIZE,
+    SERVICE_AFFECTED_ADDRESSES,
+    SERVICE_EXPORT_CAPTURE,
+    SERVICE_PROFILE,
+    SERVICE_START_CAPTURE,
 )
 from .coordinator import TauronOutageCoordinator
+from .feed import TauronCalendarFeedView
+from .fleet import async_get_fleet
+from .helpers import format_address
+from .hub import TauronHubCoordinator, is_hub
+from .profiler import async_get_profiler
+from .stats import TauronOutageStatistics
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = ["binary_sensor", "calendar", "event", "sensor"]
 
-type TauronConfigEntry = ConfigEntry[TauronOutageCoordinator]
+type TauronConfigEntry = ConfigEntry[TauronOutageCoordinator | TauronHubCoordinator]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional("refreshes", default=1): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=1000)
+        ),
+        vol.Optional("timeout", default=3600): vol.All(
+            vol.Coerce(int), vol.Range(min=10, max=86400)
+        ),
+        vol.Optional("trace_memory", default=False): cv.boolean,
+    }
+)
+
+AFFECTED_ADDRESSES_SCHEMA = vol.Schema(
+    {
+        vol.Optional("start"): cv.datetime,
+        vol.Optional("end"): cv.datetime,
+    }
+)
+
+START_CAPTURE_SCHEMA = vol.Schema(
+    {
+        vol.Optional("responses", default=DEFAULT_CAPTURE_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_CAPTURE_SIZE)
+        ),
+    }
+)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Register the integration-wide services and the iCalendar feed."""
+    hass.http.register_view(TauronCalendarFeedView(hass))
+
+    async def _async_profile(call: ServiceCall) -> None:
+        await async_get_profiler(hass).async_start(
+            list(hass.data.get(DOMAIN, {}).values()),
+            call.data["refreshes"],
+            call.data["timeout"],
+            call.data["trace_memory"],
+        )
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE, _async_profile, schema=PROFILE_SCHEMA
+    )
+
+    async def _async_affected_addresses(call: ServiceCall) -> ServiceResponse:
+        # Without a window, right now; with only a start, that moment.
+        start = dt_util.as_local(call.data.get("start") or dt_util.now())
+        end = dt_util.as_local(call.data.get("end") or start)
+        if end < start:
+            raise ServiceValidationError("The end must not be before the start")
+
+        coordinators: dict[str, TauronOutageCoordinator] = hass.data.get(DOMAIN, {})
+        affected = async_get_fleet(hass).query(start.timestamp(), end.timestamp())
+        addresses = []
+        for address_id, keys in affected.items():
+            if (coordinator := coordinators.get(address_id)) is None:
+                continue
+            outages = [
+                outage for key in keys if (outage := coordinator.outage(key)) is not None
+            ]
+            addresses.append(
+                {
+                    "entry_id": coordinator.entry.entry_id,
+                    "address_id": address_id,
+                    "address": format_address(coordinator.address),
+                    "outages": [
+                        {
+                            "start": dt_util.as_local(outage["start"]).isoformat(),
+                            "end": dt_util.as_local(outage["end"]).isoformat(),
+                            "description": outage["message"],
+                        }
+                        for outage in outages
+                    ],
+                }
+            )
+        return {
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "count": len(addresses),
+            "addresses": addresses,
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_AFFECTED_ADDRESSES,
+        _async_affected_addresses,
+        schema=AFFECTED_ADDRESSES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def _async_start_capture(call: ServiceCall) -> None:
+        async_get_capture(hass).async_start(call.data["responses"])
+
+    async def _async_export_capture(call: ServiceCall) -> ServiceResponse:
+        return await async_get_capture(hass).async_export()
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_CAPTURE,
+        _async_start_capture,
+        schema=START_CAPTURE_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_CAPTURE,
+        _async_export_capture,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: TauronConfigEntry) -> bool:
     """Set up Tauron Dystrybucja from a config entry."""
+    if is_hub(entry):
+        return await _async_setup_hub(hass, entry)
+
     coordinator = TauronOutageCoordinator(hass, entry)
     await coordinator.async_config_entry_first_refresh()
 
@@ -41,25 +179,73 @@ async def async_setup_entry(hass: HomeAssistant, entry: TauronConfigEntry) -> bo
     return True
 
 
+async def _async_setup_hub(hass: HomeAssistant, entry: TauronConfigEntry) -> bool:
+    """Set up a hub entry, with every address refreshed by one coordinator."""
+    hub = TauronHubCoordinator(hass, entry)
+    await hub.async_config_entry_first_refresh()
+
+    entry.runtime_data = hub
+    hass.data.setdefault(DOMAIN, {}).update(hub.addresses)
+    # The entities listen to their own address; without a listener of its own
+    # the hub would never be scheduled.
+    entry.async_on_unload(hub.async_add_listener(lambda: None))
+
+    # Adding or removing an address only touches that address.
+    entry.async_on_unload(entry.add_update_listener(_async_update_hub))
+
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    return True
+
+
 async def _async_reload_entry(hass: HomeAssistant, entry: TauronConfigEntry) -> None:
     """Reload the entry when its options change."""
     await hass.config_entries.async_reload(entry.entry_id)
 
 
+async def _async_update_hub(hass: HomeAssistant, entry: TauronConfigEntry) -> None:
+    """Apply a change to a hub: its addresses in place, anything else by reloading."""
+    hub: TauronHubCoordinator = entry.runtime_data
+    if dict(entry.options) != hub.options:
+        await hass.config_entries.async_reload(entry.entry_id)
+    else:
+        await hub.async_sync_addresses()
+
+
+def _address_ids(entry: ConfigEntry) -> list[str]:
+    if is_hub(entry):
+        return list(entry.data[CONF_ADDRESSES])
+    return [entry.entry_id]
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: TauronConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id, None)
+        fleet = async_get_fleet(hass)
+        for address_id in _address_ids(entry):
+            hass.data[DOMAIN].pop(address_id, None)
+            fleet.async_remove_entry(address_id)
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Drop the archived history and statistics of a removed entry's addresses."""
+    archive = async_get_archive(hass)
+    for address_id in _address_ids(entry):
+        if is_hub(entry):
+            title = format_address(entry.data[CONF_ADDRESSES][address_id])
+        else:
+            title = entry.title
+        await archive.async_remove_entry(address_id)
+        await TauronOutageStatistics(hass, address_id, title).async_remove()
+
+
 async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Migrate v1 entries, which stored plain names instead of GAIDs."""
     if entry.version >= 2:
         return True
 
-    api = TauronApi(async_get_clientsession(hass))
+    api = async_get_api(hass)
     city_name = entry.data.get("city")
     street_name = entry.data.get("street")
     house_no = entry.data.get("house_number")
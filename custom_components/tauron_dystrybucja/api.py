@@ -1,21 +1,42 @@
 """Thin async client for the public Tauron Dystrybucja web API."""
 from __future__ import annotations
 
+import asyncio
 import logging
+from contextlib import AbstractAsyncContextManager, nullcontext
 from typing import Any
 
 import aiohttp
+from homeassistant.core import HomeAssistant
 
+from .capture import ApiCapture, async_get_capture
 from .const import (
     API_BASE_URL,
+    CONNECT_TIMEOUT,
+    DEFAULT_REQUEST_TIMEOUT,
     ENDPOINT_CITIES,
     ENDPOINT_OUTAGES,
     ENDPOINT_STREETS,
 )
+from .session import TauronHttpStats, async_get_session
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def async_get_api(
+    hass: HomeAssistant, timeout: float = DEFAULT_REQUEST_TIMEOUT
+) -> TauronApi:
+    """Return a client on the integration's shared session."""
+    http = async_get_session(hass)
+    return TauronApi(
+        http.session,
+        timeout=timeout,
+        stats=http.stats,
+        capture=async_get_capture(hass),
+        slots=http.slots,
+    )
+
+
 class TauronApiError(Exception):
     """Raised when the Tauron API cannot be reached or returns an error."""
 
@@ -23,18 +44,44 @@ class TauronApiError(Exception):
 class TauronApi:
     """Wraps the three endpoints this integration needs."""
 
-    def __init__(self, session: aiohttp.ClientSession) -> None:
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        *,
+        timeout: float = DEFAULT_REQUEST_TIMEOUT,
+        stats: TauronHttpStats | None = None,
+        capture: ApiCapture | None = None,
+        slots: asyncio.Semaphore | None = None,
+    ) -> None:
         self._session = session
+        # The timeouts start once a slot is free, so queueing does not count.
+        self._timeout = aiohttp.ClientTimeout(
+            total=timeout, connect=min(timeout, CONNECT_TIMEOUT)
+        )
+        self._stats = stats
+        self._capture = capture
+        self._slots: AbstractAsyncContextManager[Any] = slots or nullcontext()
 
     async def _get(self, endpoint: str, params: dict[str, Any]) -> Any:
         url = f"{API_BASE_URL}{endpoint}"
         try:
-            async with self._session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=30)) as response:
+            async with (
+                self._slots,
+                self._session.get(url, params=params, timeout=self._timeout) as response,
+            ):
                 response.raise_for_status()
+                body = await response.read()
+                if self._stats is not None:
+                    self._stats.requests += 1
+                    self._stats.bytes_on_wire += response.content_length or 0
+                    self._stats.bytes_decoded += len(body)
                 # The API serves JSON as text/plain on some endpoints.
-                return await response.json(content_type=None)
-        except aiohttp.ClientError as err:
+                data = await response.json(content_type=None)
+        except (aiohttp.ClientError, TimeoutError) as err:
             raise TauronApiError(f"Error calling {endpoint}: {err}") from err
+        if self._capture is not None and self._capture.active:
+            await self._capture.async_record(endpoint, params, body)
+        return data
 
     async def async_get_cities(self, part_name: str) -> list[dict[str, Any]]:
         """Search for cities matching a partial name."""
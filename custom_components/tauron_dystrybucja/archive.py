@@ -0,0 +1,277 @@
+"""Local archive of every outage the integration has observed.
+
+Tauron only returns outages that have not ended yet, so anything in the past
+would otherwise have to be fetched again - or is simply gone once Tauron drops
+it. Every refresh appends what it saw to a small SQLite database in the config
+directory, and past calendar windows are answered from there.
+
+Tauron also withdraws and moves outages. An outage that is still in the future
+but no longer in the fetched window is marked withdrawn rather than deleted, so
+it is not served as history - and a moved outage is not served twice.
+"""
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.singleton import singleton
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ARCHIVE_COMPACT_INTERVAL,
+    ARCHIVE_FILENAME,
+    DEFAULT_ARCHIVE_RETENTION,
+    DOMAIN,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_ARCHIVE = f"{DOMAIN}_archive"
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS outages (
+        entry_id TEXT NOT NULL,
+        key TEXT NOT NULL,
+        outage_id INTEGER,
+        start_ts REAL,
+        end_ts REAL,
+        type_id INTEGER,
+        is_active INTEGER NOT NULL,
+        message TEXT,
+        first_seen REAL NOT NULL,
+        last_seen REAL NOT NULL,
+        -- When the outage went missing from the window it belonged to.
+        withdrawn REAL,
+        PRIMARY KEY (entry_id, key)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS outages_entry_start ON outages (entry_id, start_ts)",
+    "CREATE INDEX IF NOT EXISTS outages_entry_end ON outages (entry_id, end_ts)",
+    # When each entry started recording. A window reaching back before this is
+    # not complete locally and has to go to the API.
+    """
+    CREATE TABLE IF NOT EXISTS entries (
+        entry_id TEXT PRIMARY KEY,
+        since REAL NOT NULL
+    )
+    """,
+)
+
+# Later observations refresh the text and times, but never the first sighting.
+# An outage seen again after going missing was not withdrawn after all.
+_UPSERT = """
+    INSERT INTO outages (
+        entry_id, key, outage_id, start_ts, end_ts, type_id, is_active, message,
+        first_seen, last_seen
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (entry_id, key) DO UPDATE SET
+        end_ts = excluded.end_ts,
+        type_id = excluded.type_id,
+        is_active = excluded.is_active,
+        message = excluded.message,
+        last_seen = excluded.last_seen,
+        withdrawn = NULL
+"""
+
+# Outages of the entry that had not ended and fell in the fetched window, yet
+# were not in it.
+_WITHDRAW = """
+    UPDATE outages SET withdrawn = ?
+    WHERE entry_id = ? AND withdrawn IS NULL AND last_seen < ?
+        AND COALESCE(end_ts, start_ts) > ? AND start_ts < ?
+"""
+
+
+def _timestamp(value: datetime | None) -> float | None:
+    return value.timestamp() if value else None
+
+
+def _datetime(value: float | None) -> datetime | None:
+    return dt_util.utc_from_timestamp(value) if value is not None else None
+
+
+@singleton(DATA_ARCHIVE)
+@callback
+def async_get_archive(hass: HomeAssistant) -> TauronOutageArchive:
+    """Return the archive shared by all entries."""
+    return TauronOutageArchive(hass, hass.config.path(ARCHIVE_FILENAME))
+
+
+class TauronOutageArchive:
+    """Store of observed outages, indexed by entry and time.
+
+    Each entry keeps its history for its own retention, in days; entries that
+    have not recorded since startup get the default.
+
+    SQLite is blocking, so every public method hands its work to the executor.
+    Each job opens its own short-lived connection, which keeps the archive safe
+    to use from whichever worker thread picks the job up. One lock guards the
+    database and the state kept about it.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: str) -> None:
+        self._hass = hass
+        self._path = path
+        self._retention: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._initialised = False
+        self._last_compacted: datetime | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection, creating the schema first. Needs the lock."""
+        connection = sqlite3.connect(self._path)
+        if not self._initialised:
+            with connection:
+                for statement in _SCHEMA:
+                    connection.execute(statement)
+            self._initialised = True
+        return connection
+
+    async def async_record(
+        self,
+        entry_id: str,
+        outages: list[dict[str, Any]],
+        until: datetime,
+        retention: int = DEFAULT_ARCHIVE_RETENTION,
+    ) -> None:
+        """Record one refresh worth of outages for an entry.
+
+        The outages are everything Tauron lists up to until; any other outage
+        of the entry that had not ended by then is marked withdrawn.
+        """
+        self._retention[entry_id] = retention
+        await self._hass.async_add_executor_job(
+            self._record, entry_id, outages, until
+        )
+
+    async def async_covers(self, entry_id: str, start: datetime) -> bool:
+        """Whether the archive holds everything for an entry from start onwards."""
+        since = await self._hass.async_add_executor_job(self._since, entry_id)
+        return since is not None and since <= start.timestamp()
+
+    async def async_query(
+        self, entry_id: str, start: datetime, end: datetime
+    ) -> list[dict[str, Any]]:
+        """Return archived outages of an entry overlapping [start, end)."""
+        return await self._hass.async_add_executor_job(
+            self._query, entry_id, start, end
+        )
+
+    async def async_remove_entry(self, entry_id: str) -> None:
+        """Forget everything recorded for an entry."""
+        self._retention.pop(entry_id, None)
+        await self._hass.async_add_executor_job(self._remove_entry, entry_id)
+
+    def _record(
+        self, entry_id: str, outages: list[dict[str, Any]], until: datetime
+    ) -> None:
+        now = dt_util.utcnow()
+        seen = now.timestamp()
+        rows = [
+            (
+                entry_id,
+                outage["key"],
+                outage["id"],
+                _timestamp(outage["start"]),
+                _timestamp(outage["end"]),
+                outage["type_id"],
+                int(outage["is_active"]),
+                outage["message"],
+                seen,
+                seen,
+            )
+            for outage in outages
+        ]
+        with self._lock:
+            with closing(self._connect()) as connection, connection:
+                connection.execute(
+                    "INSERT OR IGNORE INTO entries (entry_id, since) VALUES (?, ?)",
+                    (entry_id, seen),
+                )
+                connection.executemany(_UPSERT, rows)
+                connection.execute(
+                    _WITHDRAW, (seen, entry_id, seen, seen, until.timestamp())
+                )
+
+            if (
+                self._last_compacted is None
+                or now - self._last_compacted >= ARCHIVE_COMPACT_INTERVAL
+            ):
+                self._compact(now)
+
+    def _since(self, entry_id: str) -> float | None:
+        with self._lock, closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT since FROM entries WHERE entry_id = ?", (entry_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _query(
+        self, entry_id: str, start: datetime, end: datetime
+    ) -> list[dict[str, Any]]:
+        with self._lock, closing(self._connect()) as connection:
+            rows = connection.execute(
+                """
+                SELECT key, outage_id, start_ts, end_ts, type_id, is_active, message
+                FROM outages
+                WHERE entry_id = ? AND start_ts < ? AND end_ts > ?
+                    AND withdrawn IS NULL
+                ORDER BY start_ts
+                """,
+                (entry_id, end.timestamp(), start.timestamp()),
+            ).fetchall()
+        return [
+            {
+                "id": outage_id,
+                "key": key,
+                "message": message,
+                "start": _datetime(start_ts),
+                "end": _datetime(end_ts),
+                "type_id": type_id,
+                "is_active": bool(is_active),
+            }
+            for key, outage_id, start_ts, end_ts, type_id, is_active, message in rows
+        ]
+
+    def _compact(self, now: datetime) -> None:
+        """Drop outages that ended before their retention window and reclaim space.
+
+        Needs the lock.
+        """
+        deleted = 0
+        with closing(self._connect()) as connection:
+            with connection:
+                entry_ids = [
+                    row[0] for row in connection.execute("SELECT entry_id FROM entries")
+                ]
+                for entry_id in entry_ids:
+                    days = self._retention.get(entry_id, DEFAULT_ARCHIVE_RETENTION)
+                    cutoff = (now - timedelta(days=days)).timestamp()
+                    deleted += connection.execute(
+                        """
+                        DELETE FROM outages
+                        WHERE entry_id = ? AND COALESCE(end_ts, start_ts, last_seen) < ?
+                        """,
+                        (entry_id, cutoff),
+                    ).rowcount
+                    # History before the cutoff is no longer complete.
+                    connection.execute(
+                        "UPDATE entries SET since = ? WHERE entry_id = ? AND since < ?",
+                        (cutoff, entry_id, cutoff),
+                    )
+            if deleted:
+                connection.execute("VACUUM")
+        self._last_compacted = now
+        if deleted:
+            _LOGGER.debug("Compacted outage archive, dropped %s outages", deleted)
+
+    def _remove_entry(self, entry_id: str) -> None:
+        with self._lock, closing(self._connect()) as connection, connection:
+            connection.execute("DELETE FROM outages WHERE entry_id = ?", (entry_id,))
+            connection.execute("DELETE FROM entries WHERE entry_id = ?", (entry_id,))
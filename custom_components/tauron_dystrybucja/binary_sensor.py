@@ -1,6 +1,7 @@
 """Binary sensor platform for Tauron Dystrybucja."""
 from __future__ import annotations
 
+from collections.abc import Mapping
 from typing import Any
 
 from homeassistant.components.binary_sensor import (
@@ -11,7 +12,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import TauronConfigEntry
-from .entity import TauronEntity
+from .entity import TauronEntity, async_setup_address_entities
 
 
 async def async_setup_entry(
@@ -20,7 +21,12 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the Tauron binary sensor from a config entry."""
-    async_add_entities([TauronOutageActiveSensor(entry.runtime_data)])
+    async_setup_address_entities(
+        hass,
+        entry,
+        async_add_entities,
+        lambda coordinator: [TauronOutageActiveSensor(coordinator)],
+    )
 
 
 class TauronOutageActiveSensor(TauronEntity, BinarySensorEntity):
@@ -35,15 +41,8 @@ class TauronOutageActiveSensor(TauronEntity, BinarySensorEntity):
 
     @property
     def is_on(self) -> bool:
-        return self.coordinator.data["current"] is not None
+        return self._view.ongoing
 
     @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        current = self.coordinator.data["current"]
-        if not current:
-            return {}
-        return {
-            "description": current["message"],
-            "start": current["start"],
-            "end": current["end"],
-        }
+    def extra_state_attributes(self) -> Mapping[str, Any]:
+        return self._view.ongoing_attributes
@@ -2,19 +2,15 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any
 
 from homeassistant.components.calendar import CalendarEntity, CalendarEvent
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.util import dt as dt_util
 
 from . import TauronConfigEntry
-from .const import CONF_CITY_NAME, CONF_HOUSE_NO, CONF_STREET_NAME
 from .coordinator import TauronOutageCoordinator
-from .entity import TauronEntity
-
-SUMMARY = "Wyłączenie prądu"
+from .entity import TauronEntity, async_setup_address_entities, outage_to_event
+from .helpers import format_address
 
 
 async def async_setup_entry(
@@ -23,20 +19,11 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the Tauron outage calendar."""
-    async_add_entities([TauronOutageCalendar(entry.runtime_data)])
-
-
-def _to_event(outage: dict[str, Any], location: str) -> CalendarEvent | None:
-    """Convert an outage into a calendar event, skipping incomplete ones."""
-    if not outage["start"] or not outage["end"]:
-        return None
-    return CalendarEvent(
-        start=dt_util.as_local(outage["start"]),
-        end=dt_util.as_local(outage["end"]),
-        summary=SUMMARY,
-        description=outage["message"] or "",
-        location=location,
-        uid=outage["key"],
+    async_setup_address_entities(
+        hass,
+        entry,
+        async_add_entities,
+        lambda coordinator: [TauronOutageCalendar(coordinator)],
     )
 
 
@@ -48,22 +35,23 @@ class TauronOutageCalendar(TauronEntity, CalendarEntity):
 
     def __init__(self, coordinator: TauronOutageCoordinator) -> None:
         super().__init__(coordinator, "calendar")
-        data = coordinator.entry.data
-        self._location = (
-            f"{data[CONF_CITY_NAME]}, {data[CONF_STREET_NAME]} {data[CONF_HOUSE_NO]}"
-        )
+        self._location = format_address(coordinator.address)
 
     @property
     def event(self) -> CalendarEvent | None:
         """Return the ongoing outage, or the next upcoming one."""
         data = self.coordinator.data
+        # Read even while unavailable, including before the first refresh of
+        # a hub address succeeded.
+        if data is None:
+            return None
         outage = data["current"] or data["next"]
-        return _to_event(outage, self._location) if outage else None
+        return outage_to_event(outage, self._location) if outage else None
 
     async def async_get_events(
         self, hass: HomeAssistant, start_date: datetime, end_date: datetime
     ) -> list[CalendarEvent]:
         """Return events in an explicit window, as requested by the UI."""
         outages = await self.coordinator.async_fetch_range(start_date, end_date)
-        events = [_to_event(outage, self._location) for outage in outages]
+        events = [outage_to_event(outage, self._location) for outage in outages]
         return [event for event in events if event is not None]
@@ -0,0 +1,283 @@
+"""Opt-in capture of API responses, and offline replay of a capture.
+
+Performance work needs real payloads: Tauron's messages are long and vary in
+ways synthetic data does not. Nothing is kept until the start_capture action is
+called; from then on every response body is kept as the API sent it,
+zlib-compressed in a ring buffer holding the latest few hundred. export_capture
+writes the buffer to a gzipped JSON Lines file in the config directory and
+stops capturing.
+
+House number fields are redacted, in the request parameters and in the bodies.
+Nothing else is: the city and street GAIDs stay in the parameters, and the
+outage messages list the streets and house numbers they affect.
+
+ReplaySession stands in for the aiohttp session and serves such a file, so the
+API client and everything above it run against real payloads offline and
+deterministically.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import re
+import zlib
+from collections import deque
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Any
+from urllib.parse import urlsplit
+
+import aiohttp
+from homeassistant.components.diagnostics import REDACTED, async_redact_data
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.singleton import singleton
+from homeassistant.util import dt as dt_util
+
+from .const import CONF_HOUSE_NO, DEFAULT_CAPTURE_SIZE, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_CAPTURE = f"{DOMAIN}_capture"
+
+# House numbers as the API names them in requests and responses, and as the
+# entries store them.
+TO_REDACT = {CONF_HOUSE_NO, "houseNo", "HouseNo"}
+
+# The value of any of those keys in a JSON body, string or not.
+_REDACT_BODY = re.compile(
+    r'("(?:{keys})"\s*:\s*)(?:"(?:[^"\\]|\\.)*"|[^,}}\]\s]+)'.format(
+        keys="|".join(sorted(TO_REDACT))
+    )
+)
+
+# Request parameters that differ on every poll, or were redacted; replay
+# matches a request to the capture without them.
+_UNMATCHED_PARAMS = {"fromDate", "toDate", "houseNo"}
+
+
+@singleton(DATA_CAPTURE)
+@callback
+def async_get_capture(hass: HomeAssistant) -> ApiCapture:
+    """Return the capture shared by all entries."""
+    return ApiCapture(hass)
+
+
+@dataclass(frozen=True, slots=True)
+class CapturedResponse:
+    """One API response, with the request that produced it."""
+
+    endpoint: str
+    params: dict[str, str]
+    recorded: str
+    # The body, zlib-compressed while in memory.
+    compressed: bytes
+
+    @property
+    def body(self) -> bytes:
+        """The body as the API sent it, house number fields aside."""
+        return zlib.decompress(self.compressed)
+
+
+def _redact_and_compress(body: bytes) -> bytes:
+    """Blank out the house number fields of a raw body and compress it.
+
+    Works on the text, so every other byte stays as the API sent it.
+    """
+    text = body.decode("utf-8", "surrogateescape")
+    redacted = _REDACT_BODY.sub(rf'\1"{REDACTED}"', text)
+    return zlib.compress(redacted.encode("utf-8", "surrogateescape"))
+
+
+class ApiCapture:
+    """Ring buffer of the latest API responses, empty unless started."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._responses: deque[CapturedResponse] | None = None
+
+    @property
+    def active(self) -> bool:
+        """Whether responses are being captured."""
+        return self._responses is not None
+
+    @callback
+    def async_start(self, size: int = DEFAULT_CAPTURE_SIZE) -> None:
+        """Start keeping the latest size responses, dropping any kept before."""
+        self._responses = deque(maxlen=size)
+        _LOGGER.info("Capturing the latest %s Tauron API responses", size)
+
+    async def async_record(
+        self, endpoint: str, params: dict[str, Any], body: bytes
+    ) -> None:
+        """Keep one raw response body, redacted and compressed in the executor.
+
+        Large bodies would otherwise stall the event loop, just as parsing them
+        would.
+        """
+        responses = self._responses
+        if responses is None:
+            return
+        recorded = dt_util.utcnow().isoformat()
+        compressed = await self._hass.async_add_executor_job(
+            _redact_and_compress, body
+        )
+        responses.append(
+            CapturedResponse(
+                endpoint=endpoint,
+                params={
+                    key: str(value)
+                    for key, value in async_redact_data(params, TO_REDACT).items()
+                },
+                recorded=recorded,
+                compressed=compressed,
+            )
+        )
+
+    async def async_export(self) -> dict[str, Any]:
+        """Write the captured responses to the config directory and stop.
+
+        The capture keeps running if the file cannot be written.
+        """
+        responses = self._responses
+        if responses is None:
+            raise HomeAssistantError("No capture is running")
+        captured = list(responses)
+        path = self._hass.config.path(
+            f"{DOMAIN}_capture_{dt_util.now().strftime('%Y%m%d_%H%M%S')}.jsonl.gz"
+        )
+        try:
+            await self._hass.async_add_executor_job(_write_capture, captured, path)
+        except OSError as err:
+            raise HomeAssistantError(f"Cannot write {path}: {err}") from err
+        if self._responses is responses:
+            self._responses = None
+        _LOGGER.info("Wrote %s captured responses to %s", len(captured), path)
+        return {"file": path, "responses": len(captured)}
+
+    @property
+    def summary(self) -> dict[str, Any]:
+        """What the buffer holds, for diagnostics."""
+        responses = self._responses or ()
+        return {
+            "active": self.active,
+            "responses": len(responses),
+            "compressed_bytes": sum(len(response.compressed) for response in responses),
+        }
+
+
+def _write_capture(responses: list[CapturedResponse], path: str) -> None:
+    with gzip.open(path, "wt", encoding="utf-8") as file:
+        for response in responses:
+            record = {
+                "endpoint": response.endpoint,
+                "params": response.params,
+                "recorded": response.recorded,
+                "body": response.body.decode("utf-8", "surrogateescape"),
+            }
+            file.write(json.dumps(record) + "\n")
+
+
+def load_capture(path: str) -> list[CapturedResponse]:
+    """Read a file written by export_capture, in recorded order."""
+    responses = []
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        for line in file:
+            record = json.loads(line)
+            body = record["body"].encode("utf-8", "surrogateescape")
+            responses.append(
+                CapturedResponse(
+                    endpoint=record["endpoint"],
+                    params=record["params"],
+                    recorded=record["recorded"],
+                    compressed=zlib.compress(body),
+                )
+            )
+    return responses
+
+
+def _request_key(endpoint: str, params: dict[str, Any]) -> tuple[Any, ...]:
+    return (
+        endpoint,
+        *sorted(
+            (key, str(value))
+            for key, value in params.items()
+            if key not in _UNMATCHED_PARAMS
+        ),
+    )
+
+
+class ReplaySession:
+    """Serves captured responses in place of an aiohttp.ClientSession.
+
+    A request gets the responses captured for the same endpoint and address
+    in recorded order, starting over once they run out; time windows are
+    ignored. Addresses missing from the capture get the endpoint's responses
+    in turn, so any number of addresses can be replayed from a small capture.
+    """
+
+    def __init__(self, responses: list[CapturedResponse]) -> None:
+        self._by_request: dict[tuple[Any, ...], list[CapturedResponse]] = {}
+        self._by_endpoint: dict[str, list[CapturedResponse]] = {}
+        for response in responses:
+            self._by_request.setdefault(
+                _request_key(response.endpoint, response.params), []
+            ).append(response)
+            self._by_endpoint.setdefault(response.endpoint, []).append(response)
+        self._served: dict[Any, int] = {}
+        self.requests = 0
+
+    def get(
+        self, url: str, *, params: dict[str, Any] | None = None, **_kwargs: Any
+    ) -> _ReplayResponse:
+        """Return the next captured response for this request."""
+        endpoint = urlsplit(url).path
+        key = _request_key(endpoint, params or {})
+        if key in self._by_request:
+            candidates = self._by_request[key]
+        else:
+            key = endpoint
+            candidates = self._by_endpoint.get(endpoint, [])
+        if not candidates:
+            return _ReplayResponse(None, url)
+        served = self._served.get(key, 0)
+        self._served[key] = served + 1
+        self.requests += 1
+        return _ReplayResponse(candidates[served % len(candidates)].body, url)
+
+    async def close(self) -> None:
+        """Nothing to release; present for parity with ClientSession."""
+
+
+class _ReplayResponse:
+    """The part of aiohttp.ClientResponse the API client uses."""
+
+    def __init__(self, body: bytes | None, url: str) -> None:
+        self._body = body
+        self._url = url
+        self.content_length = len(body) if body is not None else None
+
+    async def __aenter__(self) -> _ReplayResponse:
+        if self._body is None:
+            raise aiohttp.ClientError(f"Nothing captured for {self._url}")
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        return None
+
+    def raise_for_status(self) -> None:
+        """Captured responses all succeeded."""
+
+    async def read(self) -> bytes:
+        assert self._body is not None
+        return self._body
+
+    async def json(self, *, content_type: str | None = None) -> Any:
+        assert self._body is not None
+        return json.loads(self._body)
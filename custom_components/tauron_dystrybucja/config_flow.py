@@ -2,6 +2,8 @@
 from __future__ import annotations
 
 import logging
+from abc import ABC, abstractmethod
+from collections.abc import Mapping
 from typing import Any
 
 import voluptuous as vol
@@ -11,51 +13,88 @@ from homeassistant.config_entries import (
     ConfigFlowResult,
     OptionsFlow,
 )
+from homeassistant.const import CONF_NAME
 from homeassistant.core import callback
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.data_entry_flow import FlowHandler
 from homeassistant.helpers.selector import (
     NumberSelector,
     NumberSelectorConfig,
     NumberSelectorMode,
+    SelectOptionDict,
+    SelectSelector,
+    SelectSelectorConfig,
 )
+from homeassistant.util.ulid import ulid_now
 
-from .api import TauronApi, TauronApiError
+from .api import TauronApi, TauronApiError, async_get_api
 from .const import (
+    CONF_ADDRESSES,
+    CONF_ANNOUNCEMENT_DEBOUNCE,
+    CONF_ARCHIVE_RETENTION,
     CONF_CITY_GAID,
     CONF_CITY_NAME,
+    CONF_EVENT_MODE,
     CONF_HOUSE_NO,
+    CONF_PARSE_THRESHOLD,
+    CONF_REQUEST_TIMEOUT,
     CONF_SCAN_INTERVAL,
     CONF_STREET_GAID,
     CONF_STREET_NAME,
+    DEFAULT_ANNOUNCEMENT_DEBOUNCE,
+    DEFAULT_ARCHIVE_RETENTION,
+    DEFAULT_EVENT_MODE,
+    DEFAULT_HUB_NAME,
+    DEFAULT_PARSE_THRESHOLD,
+    DEFAULT_REQUEST_TIMEOUT,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
+    EVENT_MODE_PER_OUTAGE,
+    EVENT_MODE_PER_REFRESH,
+    MAX_ANNOUNCEMENT_DEBOUNCE,
+    MAX_ARCHIVE_RETENTION,
+    MAX_PARSE_THRESHOLD,
+    MAX_REQUEST_TIMEOUT,
     MAX_SCAN_INTERVAL,
+    MIN_ARCHIVE_RETENTION,
+    MIN_REQUEST_TIMEOUT,
     MIN_SCAN_INTERVAL,
     MIN_SEARCH_LENGTH,
 )
+from .helpers import format_address
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class TauronConfigFlow(ConfigFlow, domain=DOMAIN):
-    """Guide the user through city -> street -> house number."""
+def _address_key(address: Mapping[str, Any]) -> str:
+    """Identify an address by its GAIDs and house number."""
+    return (
+        f"{address[CONF_CITY_GAID]}-{address[CONF_STREET_GAID]}-{address[CONF_HOUSE_NO]}"
+    )
 
-    VERSION = 2
 
-    def __init__(self) -> None:
-        self._api: TauronApi | None = None
-        self._cities: dict[str, dict[str, Any]] = {}
-        self._streets: dict[str, dict[str, Any]] = {}
-        self._city: dict[str, Any] | None = None
-        self._street: dict[str, Any] | None = None
+class AddressSearchFlow(FlowHandler, ABC):
+    """Guide the user through city -> street -> house number.
+
+    Shared by the config flow, which creates an entry from the address, and the
+    options flow of a hub, which adds it to the hub. Starts at the address step
+    and hands the validated address to _async_address_selected.
+    """
+
+    _api: TauronApi | None = None
+    _cities: dict[str, dict[str, Any]]
+    _streets: dict[str, dict[str, Any]]
+    _city: dict[str, Any] | None = None
+    _street: dict[str, Any] | None = None
 
     @property
     def api(self) -> TauronApi:
         if self._api is None:
-            self._api = TauronApi(async_get_clientsession(self.hass))
+            self._api = async_get_api(self.hass)
         return self._api
 
-    async def async_step_user(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
+    async def async_step_address(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
         """Ask for part of the city name."""
         errors: dict[str, str] = {}
         if user_input is not None:
@@ -75,7 +114,7 @@ class TauronConfigFlow(ConfigFlow, domain=DOMAIN):
                     errors["city_partial"] = "no_cities_found"
 
         return self.async_show_form(
-            step_id="user",
+            step_id="address",
             data_schema=vol.Schema({vol.Required("city_partial"): str}),
             errors=errors,
         )
@@ -139,7 +178,7 @@ class TauronConfigFlow(ConfigFlow, domain=DOMAIN):
     async def async_step_house_number(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
-        """Ask for the house number and create the entry."""
+        """Ask for the house number and validate the address."""
         assert self._city is not None
         assert self._street is not None
         errors: dict[str, str] = {}
@@ -148,10 +187,6 @@ class TauronConfigFlow(ConfigFlow, domain=DOMAIN):
             if not house_no:
                 errors["house_no"] = "invalid_house_number"
             else:
-                unique_id = f"{self._city['GAID']}-{self._street['GAID']}-{house_no}"
-                await self.async_set_unique_id(unique_id)
-                self._abort_if_unique_id_configured()
-
                 try:
                     await self.api.async_get_outages(
                         city_gaid=self._city["GAID"],
@@ -164,17 +199,14 @@ class TauronConfigFlow(ConfigFlow, domain=DOMAIN):
                     _LOGGER.error("Error validating address: %s", err)
                     errors["base"] = "cannot_connect"
                 else:
-                    return self.async_create_entry(
-                        title=(
-                            f"{self._city['Name']}, {self._street['Name']} {house_no}"
-                        ),
-                        data={
+                    return await self._async_address_selected(
+                        {
                             CONF_CITY_NAME: self._city["Name"],
                             CONF_CITY_GAID: self._city["GAID"],
                             CONF_STREET_NAME: self._street["Name"],
                             CONF_STREET_GAID: self._street["GAID"],
                             CONF_HOUSE_NO: house_no,
-                        },
+                        }
                     )
 
         return self.async_show_form(
@@ -189,6 +221,52 @@ class TauronConfigFlow(ConfigFlow, domain=DOMAIN):
         district = city.get("DistrictName")
         return f"{city['Name']} ({district})" if district else city["Name"]
 
+    @abstractmethod
+    async def _async_address_selected(
+        self, address: dict[str, Any]
+    ) -> ConfigFlowResult:
+        """Do whatever the flow is for with a validated address."""
+
+
+class TauronConfigFlow(AddressSearchFlow, ConfigFlow, domain=DOMAIN):
+    """Set up a single address, or a hub holding several."""
+
+    VERSION = 2
+
+    def __init__(self) -> None:
+        self._hub_name: str | None = None
+
+    async def async_step_user(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
+        """Choose between a single address and a hub."""
+        return self.async_show_menu(step_id="user", menu_options=["address", "hub"])
+
+    async def async_step_hub(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
+        """Name the hub, then search for its first address."""
+        if user_input is not None:
+            self._hub_name = user_input[CONF_NAME].strip() or DEFAULT_HUB_NAME
+            return await self.async_step_address()
+
+        return self.async_show_form(
+            step_id="hub",
+            data_schema=vol.Schema(
+                {vol.Required(CONF_NAME, default=DEFAULT_HUB_NAME): str}
+            ),
+            last_step=False,
+        )
+
+    async def _async_address_selected(
+        self, address: dict[str, Any]
+    ) -> ConfigFlowResult:
+        """Create the entry: the address itself, or a hub holding it."""
+        if self._hub_name is not None:
+            return self.async_create_entry(
+                title=self._hub_name, data={CONF_ADDRESSES: {ulid_now(): address}}
+            )
+
+        await self.async_set_unique_id(_address_key(address))
+        self._abort_if_unique_id_configured()
+        return self.async_create_entry(title=format_address(address), data=address)
+
     @staticmethod
     @callback
     def async_get_options_flow(entry: ConfigEntry) -> TauronOptionsFlow:
@@ -196,23 +274,114 @@ class TauronConfigFlow(ConfigFlow, domain=DOMAIN):
         return TauronOptionsFlow()
 
 
-class TauronOptionsFlow(OptionsFlow):
-    """Lets the user tune how often the API is polled."""
+class TauronOptionsFlow(AddressSearchFlow, OptionsFlow):
+    """Lets the user tune polling, timeouts and how announcements are reported.
+
+    A hub also has its addresses managed here. Those changes go to the entry
+    data and are applied in place; the options stay as they were.
+    """
 
     async def async_step_init(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
-        """Manage the polling interval."""
+        """Offer a hub's address management next to the settings."""
+        if CONF_ADDRESSES in self.config_entry.data:
+            return self.async_show_menu(
+                step_id="init",
+                menu_options=["settings", "address", "remove_address"],
+            )
+        return await self._async_step_settings("init", user_input)
+
+    async def async_step_settings(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the settings of a hub, shared by all its addresses."""
+        return await self._async_step_settings("settings", user_input)
+
+    async def _async_address_selected(
+        self, address: dict[str, Any]
+    ) -> ConfigFlowResult:
+        """Add the address to the hub."""
+        entry = self.config_entry
+        addresses = entry.data[CONF_ADDRESSES]
+        key = _address_key(address)
+        if any(_address_key(known) == key for known in addresses.values()):
+            return self.async_abort(reason="already_configured")
+        self.hass.config_entries.async_update_entry(
+            entry,
+            data={**entry.data, CONF_ADDRESSES: {**addresses, ulid_now(): address}},
+        )
+        return self.async_create_entry(data=dict(entry.options))
+
+    async def async_step_remove_address(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Remove addresses from the hub, along with their entities and history."""
+        entry = self.config_entry
+        addresses = entry.data[CONF_ADDRESSES]
+        if user_input is not None:
+            removed = set(user_input[CONF_ADDRESSES])
+            self.hass.config_entries.async_update_entry(
+                entry,
+                data={
+                    **entry.data,
+                    CONF_ADDRESSES: {
+                        address_id: address
+                        for address_id, address in addresses.items()
+                        if address_id not in removed
+                    },
+                },
+            )
+            return self.async_create_entry(data=dict(entry.options))
+
+        return self.async_show_form(
+            step_id="remove_address",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_ADDRESSES, default=[]): SelectSelector(
+                        SelectSelectorConfig(
+                            options=[
+                                SelectOptionDict(
+                                    value=address_id, label=format_address(address)
+                                )
+                                for address_id, address in addresses.items()
+                            ],
+                            multiple=True,
+                        )
+                    ),
+                }
+            ),
+        )
+
+    async def _async_step_settings(
+        self, step_id: str, user_input: dict[str, Any] | None
+    ) -> ConfigFlowResult:
+        """Manage the polling interval, request timeout and announcement events."""
         if user_input is not None:
             return self.async_create_entry(
-                data={CONF_SCAN_INTERVAL: int(user_input[CONF_SCAN_INTERVAL])}
+                data={
+                    CONF_SCAN_INTERVAL: int(user_input[CONF_SCAN_INTERVAL]),
+                    CONF_REQUEST_TIMEOUT: int(user_input[CONF_REQUEST_TIMEOUT]),
+                    CONF_EVENT_MODE: user_input[CONF_EVENT_MODE],
+                    CONF_ANNOUNCEMENT_DEBOUNCE: int(
+                        user_input[CONF_ANNOUNCEMENT_DEBOUNCE]
+                    ),
+                    CONF_PARSE_THRESHOLD: int(user_input[CONF_PARSE_THRESHOLD]),
+                    CONF_ARCHIVE_RETENTION: int(user_input[CONF_ARCHIVE_RETENTION]),
+                }
             )
 
-        current = self.config_entry.options.get(
-            CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
+        options = self.config_entry.options
+        current = options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+        timeout = options.get(CONF_REQUEST_TIMEOUT, DEFAULT_REQUEST_TIMEOUT)
+        event_mode = options.get(CONF_EVENT_MODE, DEFAULT_EVENT_MODE)
+        debounce = options.get(
+            CONF_ANNOUNCEMENT_DEBOUNCE, DEFAULT_ANNOUNCEMENT_DEBOUNCE
         )
+        parse_threshold = options.get(CONF_PARSE_THRESHOLD, DEFAULT_PARSE_THRESHOLD)
+        retention = options.get(CONF_ARCHIVE_RETENTION, DEFAULT_ARCHIVE_RETENTION)
         return self.async_show_form(
-            step_id="init",
+            step_id=step_id,
             data_schema=vol.Schema(
                 {
                     vol.Required(CONF_SCAN_INTERVAL, default=current): NumberSelector(
@@ -223,7 +392,54 @@ class TauronOptionsFlow(OptionsFlow):
                             unit_of_measurement="min",
                             mode=NumberSelectorMode.BOX,
                         )
-                    )
+                    ),
+                    vol.Required(CONF_REQUEST_TIMEOUT, default=timeout): NumberSelector(
+                        NumberSelectorConfig(
+                            min=MIN_REQUEST_TIMEOUT,
+                            max=MAX_REQUEST_TIMEOUT,
+                            step=5,
+                            unit_of_measurement="s",
+                            mode=NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Required(CONF_EVENT_MODE, default=event_mode): SelectSelector(
+                        SelectSelectorConfig(
+                            options=[EVENT_MODE_PER_OUTAGE, EVENT_MODE_PER_REFRESH],
+                            translation_key=CONF_EVENT_MODE,
+                        )
+                    ),
+                    vol.Required(
+                        CONF_ANNOUNCEMENT_DEBOUNCE, default=debounce
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            min=0,
+                            max=MAX_ANNOUNCEMENT_DEBOUNCE,
+                            step=5,
+                            unit_of_measurement="s",
+                            mode=NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Required(
+                        CONF_PARSE_THRESHOLD, default=parse_threshold
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            min=0,
+                            max=MAX_PARSE_THRESHOLD,
+                            step=10,
+                            mode=NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Required(
+                        CONF_ARCHIVE_RETENTION, default=retention
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            min=MIN_ARCHIVE_RETENTION,
+                            max=MAX_ARCHIVE_RETENTION,
+                            step=1,
+                            unit_of_measurement="d",
+                            mode=NumberSelectorMode.BOX,
+                        )
+                    ),
                 }
             ),
         )
@@ -14,10 +14,50 @@ CONF_STREET_NAME = "street_name"
 CONF_STREET_GAID = "street_gaid"
 CONF_HOUSE_NO = "house_no"
 CONF_SCAN_INTERVAL = "scan_interval"
+CONF_REQUEST_TIMEOUT = "request_timeout"
+CONF_EVENT_MODE = "event_mode"
+CONF_ANNOUNCEMENT_DEBOUNCE = "announcement_debounce"
+CONF_PARSE_THRESHOLD = "parse_threshold"
+CONF_ADDRESSES = "addresses"
+CONF_ARCHIVE_RETENTION = "archive_retention"
+
+# A hub entry holds many addresses, keyed by an id of their own, under
+# CONF_ADDRESSES instead of being one.
+DEFAULT_HUB_NAME = "Tauron Dystrybucja"
+
+# How New outage reports a refresh that brought several announcements: one
+# event per outage, or a single event carrying all of them.
+EVENT_MODE_PER_OUTAGE = "per_outage"
+EVENT_MODE_PER_REFRESH = "per_refresh"
+DEFAULT_EVENT_MODE = EVENT_MODE_PER_OUTAGE
+
+# Seconds to collect announcements from all addresses into one bus event.
+# Zero leaves each address to its own event entity.
+DEFAULT_ANNOUNCEMENT_DEBOUNCE = 0
+MAX_ANNOUNCEMENT_DEBOUNCE = 600
+EVENT_OUTAGES_ANNOUNCED = f"{DOMAIN}_outages_announced"
+
+SERVICE_PROFILE = "profile"
+SERVICE_AFFECTED_ADDRESSES = "affected_addresses"
+SERVICE_START_CAPTURE = "start_capture"
+SERVICE_EXPORT_CAPTURE = "export_capture"
+
+# API responses kept by a capture; the oldest are dropped first.
+DEFAULT_CAPTURE_SIZE = 200
+MAX_CAPTURE_SIZE = 5000
+
+# Title of every outage in the calendar and the iCalendar feed.
+CALENDAR_SUMMARY = "Wyłączenie prądu"
 
 # How far ahead outages are fetched.
 LOOKAHEAD = timedelta(days=30)
 
+# The lookahead is fetched in two tiers. The near term is what notifications
+# depend on and is fetched on every poll; the rest of the window rarely changes
+# and is refreshed at most this often.
+NEAR_TERM = timedelta(hours=48)
+FAR_TERM_INTERVAL = timedelta(hours=6)
+
 # Polling cadence, in minutes. Tauron publishes planned outages days in advance,
 # so there is nothing to gain from polling aggressively. The floor keeps a
 # misconfigured instance from hammering a free public API.
@@ -25,5 +65,35 @@ DEFAULT_SCAN_INTERVAL = 60
 MIN_SCAN_INTERVAL = 15
 MAX_SCAN_INTERVAL = 1440
 
+# Local archive of observed outages, kept in the config directory. Outages that
+# ended longer ago than the retention, in days, are dropped; compaction runs at
+# most once per interval, piggybacking on a refresh.
+ARCHIVE_FILENAME = "tauron_dystrybucja.db"
+DEFAULT_ARCHIVE_RETENTION = 730
+MIN_ARCHIVE_RETENTION = 30
+MAX_ARCHIVE_RETENTION = 3650
+ARCHIVE_COMPACT_INTERVAL = timedelta(days=1)
+
+# HTTP pool for the API host, shared by every address. A handful of kept-alive
+# connections serves hundreds of addresses; the rest queue for a free one
+# before their timeouts start.
+HTTP_POOL_SIZE = 4
+# Addresses of a hub refreshed at once; more would only queue for the pool.
+HUB_CONCURRENCY = HTTP_POOL_SIZE
+HTTP_KEEPALIVE_TIMEOUT = 60
+DNS_CACHE_TTL = 3600
+
+# Seconds a single API call may take; connecting gets a tighter bound so a dead
+# host fails fast.
+DEFAULT_REQUEST_TIMEOUT = 30
+MIN_REQUEST_TIMEOUT = 5
+MAX_REQUEST_TIMEOUT = 120
+CONNECT_TIMEOUT = 10
+
+# Payloads with more outages than this are parsed in the executor rather than
+# on the event loop. Typical polls return a handful, wide calendar windows many.
+DEFAULT_PARSE_THRESHOLD = 50
+MAX_PARSE_THRESHOLD = 1000
+
 # Minimum length of a search phrase accepted by the Tauron API.
 MIN_SEARCH_LENGTH = 3
@@ -1,127 +1,351 @@
 """Data update coordinator for Tauron Dystrybucja."""
 from __future__ import annotations
 
+import itertools
 import logging
+import sqlite3
+import time
+from collections.abc import Mapping
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
 
-from .api import TauronApi, TauronApiError
+from .api import TauronApiError, async_get_api
+from .archive import async_get_archive
 from .const import (
+    CONF_ADDRESSES,
+    CONF_ARCHIVE_RETENTION,
     CONF_CITY_GAID,
     CONF_HOUSE_NO,
+    CONF_PARSE_THRESHOLD,
+    CONF_REQUEST_TIMEOUT,
     CONF_SCAN_INTERVAL,
     CONF_STREET_GAID,
+    DEFAULT_ARCHIVE_RETENTION,
+    DEFAULT_PARSE_THRESHOLD,
+    DEFAULT_REQUEST_TIMEOUT,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
+    FAR_TERM_INTERVAL,
     LOOKAHEAD,
+    NEAR_TERM,
 )
+from .diff import OutageChanges, OutageIndex
+from .fleet import async_get_fleet
+from .helpers import format_address
+from .stats import TauronOutageStatistics
+from .view import OutageView, build_view
 
 _LOGGER = logging.getLogger(__name__)
 
 
-def _parse_date(value: str | None) -> datetime | None:
-    """Parse an API timestamp into an aware datetime."""
+_EPOCH = dt_util.utc_from_timestamp(0)
+
+# Snapshot versions come from one counter shared by every coordinator, so a
+# coordinator recreated by a reload never repeats a version cached before it.
+_snapshot_versions = itertools.count()
+
+# A parsed timestamp: the datetime, its ISO form for outage keys and its POSIX
+# time for sorting.
+type _Timestamp = tuple[datetime | None, str, float]
+
+_MISSING: _Timestamp = (None, "unknown", 0.0)
+
+
+@lru_cache(maxsize=4096)
+def _parse_timestamp(value: str) -> _Timestamp:
+    """Parse an API timestamp, memoised.
+
+    The API sends ISO 8601, which fromisoformat handles without the general
+    parser's format sniffing; anything else still goes through Home Assistant.
+    Every poll repeats the same few timestamps, and datetimes are immutable, so
+    the results are shared - across threads too, as lru_cache is thread-safe.
+    """
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        parsed = dt_util.parse_datetime(value)
+    if parsed is None:
+        return _MISSING
+    return parsed, parsed.isoformat(), parsed.timestamp()
+
+
+def _parse_date(value: str | None) -> _Timestamp:
+    """Parse an API timestamp into an aware datetime and what derives from it."""
     if not value:
-        return None
-    return dt_util.parse_datetime(value)
+        return _MISSING
+    return _parse_timestamp(value)
+
+
+def _start_order(outage: dict[str, Any]) -> datetime:
+    return outage["start"] or _EPOCH
 
 
 def parse_outages(raw: dict[str, Any]) -> list[dict[str, Any]]:
-    """Normalise the API payload into a sorted list of outages."""
-    outages = []
+    """Normalise the API payload into a sorted list of outages.
+
+    Pure and thread-safe, so large payloads can be parsed in the executor.
+    """
+    decorated = []
     for item in raw.get("OutageItems") or []:
-        start = _parse_date(item.get("StartDate"))
-        end = _parse_date(item.get("EndDate"))
+        start, start_iso, start_ts = _parse_date(item.get("StartDate"))
+        end = _parse_date(item.get("EndDate"))[0]
         outage_id = item.get("OutageId")
-        outages.append(
-            {
-                "id": outage_id,
-                # The API reuses OutageId for separate time slots of the same
-                # works, so the start time is needed to identify an occurrence.
-                "key": f"{outage_id}-{start.isoformat() if start else 'unknown'}",
-                "message": item.get("Message"),
-                "start": start,
-                "end": end,
-                "type_id": item.get("TypeId"),
-                "is_active": bool(item.get("IsActive")),
-            }
-        )
-    outages.sort(key=lambda o: o["start"] or dt_util.utc_from_timestamp(0))
-    return outages
+        outage = {
+            "id": outage_id,
+            # The API reuses OutageId for separate time slots of the same
+            # works, so the start time is needed to identify an occurrence.
+            "key": f"{outage_id}-{start_iso}",
+            "message": item.get("Message"),
+            "start": start,
+            "end": end,
+            "type_id": item.get("TypeId"),
+            "is_active": bool(item.get("IsActive")),
+        }
+        decorated.append((start_ts, len(decorated), outage))
+    # Sorting on POSIX times skips the time zone work of comparing datetimes;
+    # the position keeps the sort stable and off the dicts.
+    decorated.sort()
+    return [outage for _, _, outage in decorated]
 
 
 class TauronOutageCoordinator(DataUpdateCoordinator[dict[str, Any]]):
-    """Fetches the outage list for one address."""
+    """Fetches the outage list for one address.
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
-        minutes = entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+    The lookahead is fetched in two tiers. The next NEAR_TERM is fetched on
+    every refresh; the rest of the window rarely changes, so it is fetched every
+    FAR_TERM_INTERVAL and reused in between.
+
+    A single-address entry is its own address. An address of a hub entry is
+    identified by its own id and keeps no timer; the hub refreshes it.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry: ConfigEntry, address_id: str | None = None
+    ) -> None:
+        if address_id is None:
+            address: Mapping[str, Any] = entry.data
+            title = entry.title
+            minutes = entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+            update_interval: timedelta | None = timedelta(minutes=minutes)
+        else:
+            address = entry.data[CONF_ADDRESSES][address_id]
+            title = format_address(address)
+            update_interval = None
         super().__init__(
             hass,
             _LOGGER,
-            name=f"{DOMAIN} {entry.title}",
-            update_interval=timedelta(minutes=minutes),
+            config_entry=entry,
+            name=f"{DOMAIN} {title}",
+            update_interval=update_interval,
         )
         self.entry = entry
-        self._api = TauronApi(async_get_clientsession(hass))
-        # None until the first successful refresh, so a restart does not
+        # Keys the archive, statistics, fleet index, feed and entity ids.
+        self.address_id = address_id or entry.entry_id
+        self.address = address
+        self.title = title
+        self._api = async_get_api(
+            hass, entry.options.get(CONF_REQUEST_TIMEOUT, DEFAULT_REQUEST_TIMEOUT)
+        )
+        self._archive = async_get_archive(hass)
+        self._archive_retention: int = entry.options.get(
+            CONF_ARCHIVE_RETENTION, DEFAULT_ARCHIVE_RETENTION
+        )
+        self.statistics = TauronOutageStatistics(hass, self.address_id, title)
+        self._index = OutageIndex()
+        self._fleet = async_get_fleet(hass)
+        self._far_term: list[dict[str, Any]] = []
+        self._far_term_fetched: datetime | None = None
+        self._parse_threshold: int = entry.options.get(
+            CONF_PARSE_THRESHOLD, DEFAULT_PARSE_THRESHOLD
+        )
+        # Seconds the last refresh spent on the event loop, not counting the
+        # state writes that follow it, for diagnostics.
+        self.last_loop_time: float | None = None
+        # Changes whenever the outage list actually changes, so consumers can
+        # cache whatever they derive from it.
+        self.snapshot_version = next(_snapshot_versions)
+        self._view: OutageView | None = None
+        self._view_source: dict[str, Any] | None = None
+        # False until the first successful refresh, so a restart does not
         # re-announce outages that were already known.
-        self._seen_keys: set[str] | None = None
+        self._primed = False
+
+    async def _async_setup(self) -> None:
+        await self.statistics.async_load()
+
+    async def async_shutdown(self) -> None:
+        """Stop refreshing and save the statistics before the entry unloads."""
+        await super().async_shutdown()
+        await self.statistics.async_flush()
 
     async def _async_update_data(self) -> dict[str, Any]:
         now = dt_util.now()
-        try:
-            raw = await self._api.async_get_outages(
-                city_gaid=self.entry.data[CONF_CITY_GAID],
-                street_gaid=self.entry.data[CONF_STREET_GAID],
-                house_no=self.entry.data[CONF_HOUSE_NO],
-                from_date=now.strftime("%Y-%m-%dT%H:%M:%S"),
-                to_date=(now + LOOKAHEAD).strftime("%Y-%m-%dT%H:%M:%S"),
+        near_term_end = now + NEAR_TERM
+        near_term, loop_time = await self._async_fetch(now, near_term_end)
+        if (
+            self._far_term_fetched is None
+            or now - self._far_term_fetched >= FAR_TERM_INTERVAL
+        ):
+            self._far_term, parse_time = await self._async_fetch(
+                near_term_end, now + LOOKAHEAD
             )
-        except TauronApiError as err:
-            raise UpdateFailed(str(err)) from err
+            self._far_term_fetched = now
+            loop_time += parse_time
 
-        outages = parse_outages(raw)
+        started = time.perf_counter()
+        # The near term is fresher, so it alone decides what starts within it.
+        # An outage straddling the boundary comes back from both tiers.
+        near_keys = {outage["key"] for outage in near_term}
+        outages = near_term + [
+            outage
+            for outage in self._far_term
+            if outage["key"] not in near_keys
+            and (outage["start"] is None or outage["start"] >= near_term_end)
+        ]
+        outages.sort(key=_start_order)
+        loop_time += time.perf_counter() - started
+        await self._async_archive(outages, now + LOOKAHEAD)
 
+        started = time.perf_counter()
         current = next(
             (o for o in outages if o["start"] and o["end"] and o["start"] <= now <= o["end"]),
             None,
         )
         upcoming = next((o for o in outages if o["start"] and o["start"] > now), None)
 
-        # Outages announced since the previous refresh. On the very first run
-        # everything is "new", but nothing is reported - otherwise every restart
-        # would replay old announcements as fresh notifications.
-        if self._seen_keys is None:
-            new_outages: list[dict[str, Any]] = []
-        else:
-            new_outages = [o for o in outages if o["key"] not in self._seen_keys]
-        self._seen_keys = {o["key"] for o in outages}
+        previous = self.data["outages"] if self.data else None
+        changes = self._index.update(outages, now)
+        # Consumers may derive anything from the list, not only what the diff
+        # classifies, so any difference at all counts.
+        if changes or outages != previous:
+            self.snapshot_version = next(_snapshot_versions)
+        # Statistics skip whatever they already counted before a restart.
+        self.statistics.async_apply(changes.appeared, changes.disappeared, now)
+        self._fleet.async_apply(
+            self.address_id, changes.appeared, changes.disappeared
+        )
+        # On the very first run everything is "added", but nothing is reported -
+        # otherwise every restart would replay old announcements as fresh
+        # notifications.
+        if not self._primed:
+            changes = OutageChanges()
+            self._primed = True
+        self.last_loop_time = loop_time + time.perf_counter() - started
 
         return {
             "outages": outages,
             "current": current,
             "next": upcoming,
-            "new": new_outages,
+            "new": changes.added,
+            "changes": changes,
         }
 
-    async def async_fetch_range(
+    @property
+    def view(self) -> OutageView:
+        """Entity state of the current data, shared by all entities of the address.
+
+        Rebuilt only when a refresh has replaced the data.
+        """
+        if self._view is None or self._view_source is not self.data:
+            self._view = build_view(self.data)
+            self._view_source = self.data
+        return self._view
+
+    def outage(self, key: str) -> dict[str, Any] | None:
+        """Return the current outage with this key, if any."""
+        return self._index.get(key)
+
+    def retained(self) -> dict[str, Any]:
+        """What this address keeps between refreshes, by structure."""
+        data = self.data or {}
+        return {
+            "outages": data.get("outages", []),
+            "far_term": self._far_term,
+            "index": self._index,
+            "changes": data.get("changes"),
+            "view": self._view,
+            "statistics": self.statistics.retained(),
+        }
+
+    async def _async_fetch(
         self, start: datetime, end: datetime
-    ) -> list[dict[str, Any]]:
-        """Fetch outages for an arbitrary window (used by the calendar)."""
+    ) -> tuple[list[dict[str, Any]], float]:
+        """Fetch and parse the outages of this address in one window.
+
+        Also returns the seconds parsing spent on the event loop. Payloads with
+        more outages than the threshold are parsed in the executor instead, so
+        a wide window does not stall the loop.
+        """
         try:
             raw = await self._api.async_get_outages(
-                city_gaid=self.entry.data[CONF_CITY_GAID],
-                street_gaid=self.entry.data[CONF_STREET_GAID],
-                house_no=self.entry.data[CONF_HOUSE_NO],
+                city_gaid=self.address[CONF_CITY_GAID],
+                street_gaid=self.address[CONF_STREET_GAID],
+                house_no=self.address[CONF_HOUSE_NO],
                 from_date=start.strftime("%Y-%m-%dT%H:%M:%S"),
                 to_date=end.strftime("%Y-%m-%dT%H:%M:%S"),
             )
         except TauronApiError as err:
             raise UpdateFailed(str(err)) from err
+        if len(raw.get("OutageItems") or ()) > self._parse_threshold:
+            return (
+                await self.hass.async_add_executor_job(self.parse_in_executor, raw),
+                0.0,
+            )
+        started = time.perf_counter()
+        outages = parse_outages(raw)
+        return outages, time.perf_counter() - started
+
+    def parse_in_executor(self, raw: dict[str, Any]) -> list[dict[str, Any]]:
+        """Parse a payload above the threshold; runs in the executor.
+
+        A method of its own so the profiler can time it.
+        """
         return parse_outages(raw)
+
+    async def _async_archive(
+        self, outages: list[dict[str, Any]], until: datetime
+    ) -> None:
+        """Keep a local copy of what was seen; losing it must not fail a refresh."""
+        try:
+            await self._archive.async_record(
+                self.address_id, outages, until, self._archive_retention
+            )
+        except sqlite3.Error as err:
+            _LOGGER.warning("Cannot archive outages for %s: %s", self.title, err)
+
+    async def async_fetch_range(
+        self, start: datetime, end: datetime
+    ) -> list[dict[str, Any]]:
+        """Fetch outages for an arbitrary window (used by the calendar).
+
+        The past part of the window comes from the local archive when it reaches
+        back far enough, so browsing history does not cost API requests.
+        """
+        now = dt_util.now()
+        archived: list[dict[str, Any]] = []
+        if start < now:
+            try:
+                if await self._archive.async_covers(self.address_id, start):
+                    archived = await self._archive.async_query(
+                        self.address_id, start, min(end, now)
+                    )
+                    if end <= now:
+                        return archived
+                    start = now
+            except sqlite3.Error as err:
+                _LOGGER.warning("Cannot read the outage archive: %s", err)
+
+        fetched, _ = await self._async_fetch(start, end)
+        if not archived:
+            return fetched
+
+        # An outage in progress is both archived and fetched; the fetch is newer.
+        merged = {outage["key"]: outage for outage in archived}
+        merged.update((outage["key"], outage) for outage in fetched)
+        return sorted(merged.values(), key=_start_order)
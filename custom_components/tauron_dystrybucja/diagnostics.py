@@ -7,7 +7,13 @@ from homeassistant.components.diagnostics import async_redact_data
 from homeassistant.core import HomeAssistant
 
 from . import TauronConfigEntry
+from .capture import async_get_capture
 from .const import CONF_HOUSE_NO
+from .coordinator import TauronOutageCoordinator
+from .hub import TauronHubCoordinator
+from .memory import async_address_memory, async_integration_memory
+from .profiler import async_get_profiler
+from .session import async_get_session
 
 TO_REDACT = {CONF_HOUSE_NO}
 
@@ -16,19 +22,58 @@ async def async_get_config_entry_diagnostics(
     hass: HomeAssistant, entry: TauronConfigEntry
 ) -> dict[str, Any]:
     """Return diagnostics for a config entry."""
-    coordinator = entry.runtime_data
-    data = coordinator.data or {}
-
-    return {
+    runtime = entry.runtime_data
+    # Measured once for every address; this entry's are picked out below.
+    memory = async_address_memory(hass)
+    diagnostics: dict[str, Any] = {
         "entry": {
             "data": async_redact_data(dict(entry.data), TO_REDACT),
             "options": dict(entry.options),
             "version": entry.version,
         },
+        # Shared by every address, so the same figures appear in each entry.
+        "http": async_get_session(hass).stats.as_dict(),
+        # Approximate bytes retained, for this address and for all of them.
+        "memory": {"integration": async_integration_memory(hass, memory)},
+        # The last run of the profile service, across all entries.
+        "profile": async_get_profiler(hass).summary,
+        # Responses held by the capture action, if one is running.
+        "capture": async_get_capture(hass).summary,
+    }
+    if isinstance(runtime, TauronHubCoordinator):
+        diagnostics["hub"] = {
+            "last_update_success": runtime.last_update_success,
+            "update_interval": str(runtime.update_interval),
+        }
+        diagnostics["addresses"] = {
+            address_id: _address_diagnostics(coordinator, memory.get(address_id))
+            for address_id, coordinator in runtime.addresses.items()
+        }
+    else:
+        address = _address_diagnostics(runtime, memory.get(runtime.address_id))
+        diagnostics["coordinator"] = address["coordinator"]
+        diagnostics["memory"]["entry"] = address["memory"]
+        diagnostics["outages"] = address["outages"]
+    return diagnostics
+
+
+def _address_diagnostics(
+    coordinator: TauronOutageCoordinator, memory: dict[str, int] | None
+) -> dict[str, Any]:
+    """What a single address reports, on its own or as part of a hub."""
+    data = coordinator.data or {}
+    return {
         "coordinator": {
             "last_update_success": coordinator.last_update_success,
             "update_interval": str(coordinator.update_interval),
+            "last_refresh_loop_ms": (
+                round(coordinator.last_loop_time * 1000, 3)
+                if coordinator.last_loop_time is not None
+                else None
+            ),
         },
+        # Approximate bytes retained by this address.
+        "memory": memory,
         "outages": [
             {
                 "key": outage["key"],
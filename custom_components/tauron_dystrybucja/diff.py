@@ -0,0 +1,139 @@
+"""Classify what changed between two consecutive outage snapshots."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+Outage = dict[str, Any]
+
+
+@dataclass(slots=True)
+class OutageChanges:
+    """Everything that happened to the outage list in one refresh."""
+
+    added: list[Outage] = field(default_factory=list)
+    # Gone before ending: withdrawn by Tauron.
+    removed: list[Outage] = field(default_factory=list)
+    # Gone after ending: it simply happened.
+    expired: list[Outage] = field(default_factory=list)
+    # (previous, current) pairs sharing an OutageId with different times:
+    # moved to another start, or extended or shortened in place.
+    rescheduled: list[tuple[Outage, Outage]] = field(default_factory=list)
+    # (previous, current) pairs of the same works with a different
+    # description, whether or not they were also rescheduled.
+    changed: list[tuple[Outage, Outage]] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(
+            self.added or self.removed or self.expired or self.rescheduled or self.changed
+        )
+
+    @property
+    def appeared(self) -> list[Outage]:
+        """Occurrences new in this snapshot, whether announced or moved here."""
+        return self.added + [current for _, current in self.rescheduled]
+
+    @property
+    def disappeared(self) -> list[Outage]:
+        """Occurrences missing from this snapshot, for whatever reason."""
+        return (
+            self.removed
+            + self.expired
+            + [previous for previous, _ in self.rescheduled]
+        )
+
+
+def _start_key(outage: Outage) -> float:
+    start = outage["start"]
+    return start.timestamp() if start else 0.0
+
+
+class OutageIndex:
+    """The latest snapshot, keyed by occurrence and by OutageId.
+
+    The key of an occurrence includes its start time, so moving an outage looks
+    like one key vanishing and another appearing. Both sides are matched up
+    through the OutageId index, which is updated in place rather than rebuilt.
+    """
+
+    def __init__(self) -> None:
+        self._by_key: dict[str, Outage] = {}
+        self._by_id: dict[Any, set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._by_key
+
+    def get(self, key: str) -> Outage | None:
+        """Return the current occurrence with this key, if any."""
+        return self._by_key.get(key)
+
+    def update(self, outages: list[Outage], now: datetime) -> OutageChanges:
+        """Replace the snapshot and return what changed."""
+        changes = OutageChanges()
+        by_key = self._by_key
+        seen: set[str] = set()
+        appeared: list[Outage] = []
+
+        for outage in outages:
+            key = outage["key"]
+            seen.add(key)
+            previous = by_key.get(key)
+            if previous is None:
+                appeared.append(outage)
+                continue
+            if previous["message"] != outage["message"]:
+                changes.changed.append((previous, outage))
+            if previous["end"] != outage["end"]:
+                # Same start, new end: extended or shortened in place. It is
+                # replaced through the disappeared and appeared lists below.
+                changes.rescheduled.append((previous, outage))
+                continue
+            by_key[key] = outage
+
+        gone = [by_key[key] for key in by_key.keys() - seen]
+
+        # Pair vanished and appeared occurrences of the same works, in start
+        # order. Ended occurrences cannot have been moved, and outages without
+        # an OutageId cannot be told apart from unrelated ones.
+        appeared_by_id: dict[Any, list[Outage]] = {}
+        for outage in appeared:
+            if outage["id"] is not None and outage["id"] in self._by_id:
+                appeared_by_id.setdefault(outage["id"], []).append(outage)
+        gone.sort(key=_start_key)
+        for outage in gone:
+            end = outage["end"]
+            if end is not None and end <= now:
+                changes.expired.append(outage)
+                continue
+            candidates = appeared_by_id.get(outage["id"])
+            if candidates:
+                current = candidates.pop(0)
+                changes.rescheduled.append((outage, current))
+                if outage["message"] != current["message"]:
+                    changes.changed.append((outage, current))
+            else:
+                changes.removed.append(outage)
+
+        rescheduled_keys = {current["key"] for _, current in changes.rescheduled}
+        changes.added = [o for o in appeared if o["key"] not in rescheduled_keys]
+
+        for outage in changes.disappeared:
+            self._discard(outage)
+        for outage in changes.appeared:
+            by_key[outage["key"]] = outage
+            if outage["id"] is not None:
+                self._by_id.setdefault(outage["id"], set()).add(outage["key"])
+        return changes
+
+    def _discard(self, outage: Outage) -> None:
+        key = outage["key"]
+        del self._by_key[key]
+        keys = self._by_id.get(outage["id"])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_id[outage["id"]]
@@ -1,11 +1,70 @@
 """Shared entity base for Tauron Dystrybucja."""
 from __future__ import annotations
 
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.components.calendar import CalendarEvent
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
-from .const import CONF_CITY_NAME, CONF_HOUSE_NO, CONF_STREET_NAME, DOMAIN
+from .const import CALENDAR_SUMMARY, DOMAIN
 from .coordinator import TauronOutageCoordinator
+from .helpers import format_address
+from .hub import TauronHubCoordinator, signal_address_added
+from .view import OutageView
+
+
+@callback
+def async_setup_address_entities(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+    create: Callable[[TauronOutageCoordinator], list[Entity]],
+) -> None:
+    """Add the entities of every address of an entry.
+
+    A hub gains addresses while it runs; their entities are added as they come.
+    """
+    runtime = entry.runtime_data
+    if not isinstance(runtime, TauronHubCoordinator):
+        async_add_entities(create(runtime))
+        return
+
+    @callback
+    def _async_add_address(coordinator: TauronOutageCoordinator) -> None:
+        async_add_entities(create(coordinator))
+
+    for coordinator in runtime.addresses.values():
+        _async_add_address(coordinator)
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, signal_address_added(entry.entry_id), _async_add_address
+        )
+    )
+
+
+def outage_to_event(outage: dict[str, Any], location: str) -> CalendarEvent | None:
+    """Convert an outage into a calendar event, skipping incomplete ones.
+
+    Shared by the calendar entity and the iCalendar feed, so both agree.
+    """
+    if not outage["start"] or not outage["end"]:
+        return None
+    return CalendarEvent(
+        start=dt_util.as_local(outage["start"]),
+        end=dt_util.as_local(outage["end"]),
+        summary=CALENDAR_SUMMARY,
+        description=outage["message"] or "",
+        location=location,
+        uid=outage["key"],
+    )
 
 
 class TauronEntity(CoordinatorEntity[TauronOutageCoordinator]):
@@ -15,16 +74,15 @@ class TauronEntity(CoordinatorEntity[TauronOutageCoordinator]):
 
     def __init__(self, coordinator: TauronOutageCoordinator, key: str) -> None:
         super().__init__(coordinator)
-        entry = coordinator.entry
-        self._attr_unique_id = f"{entry.entry_id}-{key}"
-        data = entry.data
-        address = (
-            f"{data[CONF_CITY_NAME]}, {data[CONF_STREET_NAME]} {data[CONF_HOUSE_NO]}"
-        )
+        self._attr_unique_id = f"{coordinator.address_id}-{key}"
         self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, entry.entry_id)},
-            name=f"Tauron {address}",
+            identifiers={(DOMAIN, coordinator.address_id)},
+            name=f"Tauron {format_address(coordinator.address)}",
             manufacturer="Tauron Dystrybucja",
             model="Wyłączenia prądu",
             configuration_url="https://www.tauron-dystrybucja.pl/wylaczenia/wylaczenia-planowane",
         )
+
+    @property
+    def _view(self) -> OutageView:
+        return self.coordinator.view
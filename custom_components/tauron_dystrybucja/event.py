@@ -1,16 +1,35 @@
 """Event platform for Tauron Dystrybucja."""
 from __future__ import annotations
 
+from datetime import datetime
+from functools import partial
+from typing import Any
+
 from homeassistant.components.event import EventEntity
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.singleton import singleton
 from homeassistant.util import dt as dt_util
 
 from . import TauronConfigEntry
+from .const import (
+    CONF_ANNOUNCEMENT_DEBOUNCE,
+    CONF_EVENT_MODE,
+    DEFAULT_ANNOUNCEMENT_DEBOUNCE,
+    DEFAULT_EVENT_MODE,
+    DOMAIN,
+    EVENT_MODE_PER_REFRESH,
+    EVENT_OUTAGES_ANNOUNCED,
+)
 from .coordinator import TauronOutageCoordinator
-from .entity import TauronEntity
+from .entity import TauronEntity, async_setup_address_entities
 
 EVENT_NEW_OUTAGE = "new_outage"
+EVENT_NEW_OUTAGES = "new_outages"
+EVENT_OUTAGE_REMOVED = "outage_removed"
+EVENT_OUTAGE_RESCHEDULED = "outage_rescheduled"
+EVENT_OUTAGE_CHANGED = "outage_changed"
 
 
 async def async_setup_entry(
@@ -18,33 +37,204 @@ async def async_setup_entry(
     entry: TauronConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    """Set up the Tauron announcement event entity."""
-    async_add_entities([TauronNewOutageEvent(entry.runtime_data)])
+    """Set up the Tauron announcement event entities."""
+    # Announcements of this entry still waiting for the combined event must
+    # not outlive it.
+    entry.async_on_unload(
+        partial(_async_get_batch(hass).async_discard, entry.entry_id)
+    )
+    async_setup_address_entities(
+        hass,
+        entry,
+        async_add_entities,
+        lambda coordinator: [
+            TauronNewOutageEvent(coordinator),
+            TauronOutageChangeEvent(coordinator),
+        ],
+    )
+
+
+def _isoformat(value: datetime | None) -> str | None:
+    return dt_util.as_local(value).isoformat() if value else None
+
+
+def _event_data(outage: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "outage_id": outage["id"],
+        "description": outage["message"],
+        "start": _isoformat(outage["start"]),
+        "end": _isoformat(outage["end"]),
+    }
+
+
+@singleton(f"{DOMAIN}_announcement_batch")
+@callback
+def _async_get_batch(hass: HomeAssistant) -> AnnouncementBatch:
+    return AnnouncementBatch(hass)
+
+
+class AnnouncementBatch:
+    """Collects announcements from every address into one bus event.
+
+    The window opens with the first contribution and is not extended by later
+    ones, so a steady trickle still gets delivered.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._addresses: dict[str, dict[str, Any]] = {}
+        # The entry each queued address belongs to.
+        self._entries: dict[str, str] = {}
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_add(
+        self, coordinator: TauronOutageCoordinator, outages: list[dict[str, Any]], delay: float
+    ) -> None:
+        """Queue one address's new outages for the next combined event."""
+        address = self._addresses.setdefault(
+            coordinator.address_id,
+            {
+                "entry_id": coordinator.entry.entry_id,
+                "address_id": coordinator.address_id,
+                "address": coordinator.title,
+                "outages": [],
+            },
+        )
+        address["outages"].extend(_event_data(outage) for outage in outages)
+        self._entries[coordinator.address_id] = coordinator.entry.entry_id
+        if self._unsub is None:
+            self._unsub = async_call_later(self._hass, delay, self._async_fire)
+
+    @callback
+    def async_discard(self, entry_id: str) -> None:
+        """Drop what an unloaded entry queued, and the timer if nothing is left."""
+        for address_id in [
+            address_id
+            for address_id, owner in self._entries.items()
+            if owner == entry_id
+        ]:
+            del self._entries[address_id]
+            del self._addresses[address_id]
+        if not self._addresses and self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _async_fire(self, _now: datetime) -> None:
+        self._unsub = None
+        addresses = list(self._addresses.values())
+        self._addresses = {}
+        self._entries = {}
+        self._hass.bus.async_fire(
+            EVENT_OUTAGES_ANNOUNCED,
+            {
+                "count": sum(len(address["outages"]) for address in addresses),
+                "addresses": addresses,
+            },
+        )
+
+
+class TauronEventEntity(TauronEntity, EventEntity):
+    """An event entity that records every event it triggers.
 
+    The entity only holds the last event triggered, so each one is written to
+    the state machine before the next, or all but the last would be lost.
+    """
 
-class TauronNewOutageEvent(TauronEntity, EventEntity):
-    """Fires when Tauron announces an outage that was not known before."""
+    @callback
+    def _async_fire(self, event_type: str, data: dict[str, Any]) -> None:
+        self._trigger_event(event_type, data)
+        self.async_write_ha_state()
+
+
+class TauronNewOutageEvent(TauronEventEntity):
+    """Fires when Tauron announces an outage that was not known before.
+
+    By default every outage gets its own event. A bulk announcement can instead
+    be coalesced into one event per refresh. With a debounce window the
+    outages also go into a single bus event shared by all addresses.
+    """
 
     _attr_translation_key = "new_outage"
-    _attr_event_types = [EVENT_NEW_OUTAGE]
+    _attr_event_types = [EVENT_NEW_OUTAGE, EVENT_NEW_OUTAGES]
     _attr_icon = "mdi:bell-alert"
 
     def __init__(self, coordinator: TauronOutageCoordinator) -> None:
         super().__init__(coordinator, "new_outage")
+        options = coordinator.entry.options
+        self._per_refresh = (
+            options.get(CONF_EVENT_MODE, DEFAULT_EVENT_MODE) == EVENT_MODE_PER_REFRESH
+        )
+        self._debounce = options.get(
+            CONF_ANNOUNCEMENT_DEBOUNCE, DEFAULT_ANNOUNCEMENT_DEBOUNCE
+        )
 
     @callback
     def _handle_coordinator_update(self) -> None:
-        """Trigger one event per newly announced outage."""
-        for outage in self.coordinator.data["new"]:
-            start = outage["start"]
-            end = outage["end"]
-            self._trigger_event(
-                EVENT_NEW_OUTAGE,
+        """Trigger events for newly announced outages."""
+        # A failed refresh learned nothing new; its data is the previous one.
+        if not self.coordinator.last_update_success:
+            super()._handle_coordinator_update()
+            return
+        new_outages = self.coordinator.data["new"]
+        if new_outages and self._debounce:
+            _async_get_batch(self.hass).async_add(
+                self.coordinator, new_outages, self._debounce
+            )
+        if new_outages and self._per_refresh:
+            self._async_fire(
+                EVENT_NEW_OUTAGES,
                 {
-                    "outage_id": outage["id"],
-                    "description": outage["message"],
-                    "start": dt_util.as_local(start).isoformat() if start else None,
-                    "end": dt_util.as_local(end).isoformat() if end else None,
+                    "count": len(new_outages),
+                    "outages": [_event_data(outage) for outage in new_outages],
                 },
             )
+        else:
+            for outage in new_outages:
+                self._async_fire(EVENT_NEW_OUTAGE, _event_data(outage))
+        super()._handle_coordinator_update()
+
+
+class TauronOutageChangeEvent(TauronEventEntity):
+    """Fires when a known outage is withdrawn, moved or re-described.
+
+    Kept apart from the announcement entity so automations listening for new
+    outages are not woken up by every later edit.
+    """
+
+    _attr_translation_key = "outage_change"
+    _attr_event_types = [
+        EVENT_OUTAGE_REMOVED,
+        EVENT_OUTAGE_RESCHEDULED,
+        EVENT_OUTAGE_CHANGED,
+    ]
+    _attr_icon = "mdi:calendar-edit"
+
+    def __init__(self, coordinator: TauronOutageCoordinator) -> None:
+        super().__init__(coordinator, "outage_change")
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Trigger one event per withdrawn, moved or re-described outage."""
+        if not self.coordinator.last_update_success:
+            super()._handle_coordinator_update()
+            return
+        changes = self.coordinator.data["changes"]
+        for outage in changes.removed:
+            self._async_fire(EVENT_OUTAGE_REMOVED, _event_data(outage))
+        for previous, outage in changes.rescheduled:
+            self._async_fire(
+                EVENT_OUTAGE_RESCHEDULED,
+                {
+                    **_event_data(outage),
+                    "previous_start": _isoformat(previous["start"]),
+                    "previous_end": _isoformat(previous["end"]),
+                },
+            )
+        for previous, outage in changes.changed:
+            self._async_fire(
+                EVENT_OUTAGE_CHANGED,
+                {**_event_data(outage), "previous_description": previous["message"]},
+            )
         super()._handle_coordinator_update()
@@ -0,0 +1,167 @@
+"""iCalendar feeds of the outages, for consumers outside Home Assistant.
+
+Each address is served at /api/tauron_dystrybucja/<entry_id>.ics and every
+address together at /api/tauron_dystrybucja/all.ics. Feeds are rendered from the
+coordinator data only - never from the API - and cached until an outage list
+actually changes. Pollers that send If-None-Match get a 304 without anything
+being rendered.
+"""
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+
+from aiohttp import hdrs, web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .coordinator import TauronOutageCoordinator
+from .entity import outage_to_event
+from .helpers import format_address
+
+FEED_ALL = "all"
+CONTENT_TYPE = "text/calendar"
+
+
+@dataclass(slots=True, frozen=True)
+class _RenderedFeed:
+    versions: tuple[tuple[str, int], ...]
+    etag: str
+    body: bytes
+
+
+def _escape(text: str) -> str:
+    """Escape a TEXT value (RFC 5545, 3.3.11)."""
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """Fold a content line at 75 octets without splitting a character."""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line
+    parts = []
+    limit = 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        # Step back off UTF-8 continuation bytes.
+        while cut < len(encoded) and encoded[cut] & 0xC0 == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode())
+        encoded = encoded[cut:]
+        # Continuation lines start with a space, which counts.
+        limit = 74
+    return "\r\n ".join(parts)
+
+
+def _utc(value: datetime) -> str:
+    return dt_util.as_utc(value).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _render(
+    coordinators: list[TauronOutageCoordinator], name: str
+) -> tuple[bytes, str]:
+    """Render a feed, returning it with an ETag.
+
+    The ETag leaves out DTSTAMP, so re-rendering identical outages - after a
+    restart, say - keeps the tag clients already hold.
+    """
+    stamp = _utc(dt_util.utcnow())
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//Tauron Dystrybucja//Home Assistant//PL",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_escape(name)}",
+    ]
+    for coordinator in coordinators:
+        if not coordinator.data:
+            continue
+        location = format_address(coordinator.address)
+        for outage in coordinator.data["outages"]:
+            event = outage_to_event(outage, location)
+            if event is None:
+                continue
+            lines += [
+                "BEGIN:VEVENT",
+                # Outage keys are only unique per address.
+                f"UID:{coordinator.address_id}-{event.uid}@{DOMAIN}",
+                f"DTSTAMP:{stamp}",
+                f"DTSTART:{_utc(event.start)}",
+                f"DTEND:{_utc(event.end)}",
+                f"SUMMARY:{_escape(event.summary)}",
+                f"DESCRIPTION:{_escape(event.description or '')}",
+                f"LOCATION:{_escape(event.location or '')}",
+                "END:VEVENT",
+            ]
+    lines.append("END:VCALENDAR")
+    digest = hashlib.sha1(
+        "\n".join(line for line in lines if not line.startswith("DTSTAMP:")).encode()
+    ).hexdigest()
+    body = ("\r\n".join(_fold(line) for line in lines) + "\r\n").encode()
+    return body, f'"{digest}"'
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip().removeprefix("W/")
+        if candidate in ("*", etag):
+            return True
+    return False
+
+
+class TauronCalendarFeedView(HomeAssistantView):
+    """Serves the cached iCalendar feeds."""
+
+    url = "/api/tauron_dystrybucja/{feed}.ics"
+    name = "api:tauron_dystrybucja:feed"
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._cache: dict[str, _RenderedFeed] = {}
+
+    async def get(self, request: web.Request, feed: str) -> web.Response:
+        """Return a feed, or 304 when the client already has this version."""
+        coordinators: dict[str, TauronOutageCoordinator] = self._hass.data.get(
+            DOMAIN, {}
+        )
+        if feed == FEED_ALL:
+            selected = [coordinators[key] for key in sorted(coordinators)]
+            name = "Tauron Dystrybucja"
+        elif feed in coordinators:
+            selected = [coordinators[feed]]
+            name = f"Tauron {coordinators[feed].title}"
+        else:
+            return web.Response(status=404)
+
+        versions = tuple(
+            (coordinator.address_id, coordinator.snapshot_version)
+            for coordinator in selected
+        )
+        rendered = self._cache.get(feed)
+        if rendered is None or rendered.versions != versions:
+            body, etag = _render(selected, name)
+            rendered = _RenderedFeed(versions, etag, body)
+            self._cache[feed] = rendered
+
+        headers = {hdrs.ETAG: rendered.etag, hdrs.CACHE_CONTROL: "no-cache"}
+        if _etag_matches(request.headers.get(hdrs.IF_NONE_MATCH), rendered.etag):
+            return web.Response(status=304, headers=headers)
+        return web.Response(
+            body=rendered.body,
+            content_type=CONTENT_TYPE,
+            charset="utf-8",
+            headers=headers,
+        )
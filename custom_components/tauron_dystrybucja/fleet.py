@@ -0,0 +1,201 @@
+"""Time index of the outages of every address, for fleet-wide questions.
+
+Answers "which addresses are without power at this moment, or at some point in
+this window" without walking each coordinator's outage list. Outages are kept
+as parallel columns sorted by start time - start and end as compact float
+arrays, plus the address and key of each - and updated with what changed in
+each refresh, never rebuilt.
+
+An outage overlaps a window when it starts before the window ends and ends
+after it starts. Sorting by start bounds the first condition with one bisect;
+no outage is longer than the longest one indexed, so nothing starting earlier
+than that before the window can reach it, which bounds the other end. Queries
+cost a logarithmic search plus the outages in that slice.
+"""
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.singleton import singleton
+
+from .const import DOMAIN
+
+DATA_FLEET = f"{DOMAIN}_fleet"
+
+
+@singleton(DATA_FLEET)
+@callback
+def async_get_fleet(hass: HomeAssistant) -> FleetIndex:
+    """Return the index shared by all entries."""
+    return FleetIndex()
+
+
+class FleetIndex:
+    """Outages of every address, sorted by start time.
+
+    Outages without both a start and an end cannot be placed in time and are
+    left out.
+    """
+
+    def __init__(self) -> None:
+        self._starts = array("d")
+        self._ends = array("d")
+        self._entries: list[str] = []
+        self._keys: list[str] = []
+        # Every end again, sorted, to find the next moment anything changes.
+        self._sorted_ends = array("d")
+        # Every duration, sorted, so the longest is known after removals too.
+        self._durations = array("d")
+        self._listeners: list[CALLBACK_TYPE] = []
+        # The fleet-wide sensor belongs to one entry's platform at a time; the
+        # others stand by to take it over when that entry unloads.
+        self._hosts: dict[str, Callable[[], None]] = {}
+        self._host: str | None = None
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    @callback
+    def async_apply(
+        self,
+        entry_id: str,
+        appeared: list[dict[str, Any]],
+        disappeared: list[dict[str, Any]],
+    ) -> None:
+        """Fold one refresh of an address into the index."""
+        if not appeared and not disappeared:
+            return
+        # Removed first: an outage moved in place leaves and comes back under
+        # the same key.
+        for outage in disappeared:
+            self._remove(entry_id, outage)
+        for outage in appeared:
+            self._insert(entry_id, outage)
+        self._async_notify()
+
+    @callback
+    def async_remove_entry(self, entry_id: str) -> None:
+        """Drop every outage of an unloaded address."""
+        keep = [i for i, entry in enumerate(self._entries) if entry != entry_id]
+        if len(keep) == len(self._entries):
+            return
+        self._starts = array("d", (self._starts[i] for i in keep))
+        self._ends = array("d", (self._ends[i] for i in keep))
+        self._entries = [self._entries[i] for i in keep]
+        self._keys = [self._keys[i] for i in keep]
+        self._sorted_ends = array("d", sorted(self._ends))
+        self._durations = array(
+            "d",
+            sorted(
+                end - start
+                for start, end in zip(self._starts, self._ends, strict=True)
+            ),
+        )
+        self._async_notify()
+
+    def _insert(self, entry_id: str, outage: dict[str, Any]) -> None:
+        if outage["start"] is None or outage["end"] is None:
+            return
+        start = outage["start"].timestamp()
+        end = outage["end"].timestamp()
+        i = bisect_right(self._starts, start)
+        self._starts.insert(i, start)
+        self._ends.insert(i, end)
+        self._entries.insert(i, entry_id)
+        self._keys.insert(i, outage["key"])
+        insort(self._sorted_ends, end)
+        insort(self._durations, end - start)
+
+    def _remove(self, entry_id: str, outage: dict[str, Any]) -> None:
+        if outage["start"] is None or outage["end"] is None:
+            return
+        start = outage["start"].timestamp()
+        key = outage["key"]
+        i = bisect_left(self._starts, start)
+        while i < len(self._starts) and self._starts[i] == start:
+            if self._keys[i] == key and self._entries[i] == entry_id:
+                del self._sorted_ends[bisect_left(self._sorted_ends, self._ends[i])]
+                del self._durations[
+                    bisect_left(self._durations, self._ends[i] - self._starts[i])
+                ]
+                del self._starts[i]
+                del self._ends[i]
+                del self._entries[i]
+                del self._keys[i]
+                return
+            i += 1
+
+    def query(self, start: float, end: float) -> dict[str, list[str]]:
+        """Addresses with an outage overlapping [start, end], with its keys.
+
+        Times are POSIX timestamps; pass the same one twice for a moment.
+        """
+        longest = self._durations[-1] if self._durations else 0.0
+        first = bisect_left(self._starts, start - longest)
+        last = bisect_right(self._starts, end)
+        ends = self._ends
+        affected: dict[str, list[str]] = {}
+        for i in range(first, last):
+            if ends[i] >= start:
+                affected.setdefault(self._entries[i], []).append(self._keys[i])
+        return affected
+
+    def next_change(self, after: float) -> float | None:
+        """The next moment an address gains or loses power, if any.
+
+        An outage still counts at the very second it ends, so it is gone one
+        second later.
+        """
+        candidates = []
+        i = bisect_right(self._starts, after)
+        if i < len(self._starts):
+            candidates.append(self._starts[i])
+        i = bisect_left(self._sorted_ends, after)
+        if i < len(self._sorted_ends):
+            candidates.append(self._sorted_ends[i] + 1)
+        return min(candidates, default=None)
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call back whenever the index changes."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def _remove() -> None:
+            self._listeners.remove(update_callback)
+
+        return _remove
+
+    @callback
+    def _async_notify(self) -> None:
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    @callback
+    def async_register_host(
+        self, entry_id: str, add_sensor: Callable[[], None]
+    ) -> CALLBACK_TYPE:
+        """Offer an entry's sensor platform as home for the fleet-wide sensor.
+
+        The first entry gets the sensor at once. When it unloads, its sensor
+        goes with it and the next entry's platform adds a new one.
+        """
+        self._hosts[entry_id] = add_sensor
+        if self._host is None:
+            self._host = entry_id
+            add_sensor()
+
+        @callback
+        def _unregister() -> None:
+            self._hosts.pop(entry_id, None)
+            if self._host != entry_id:
+                return
+            self._host = next(iter(self._hosts), None)
+            if self._host is not None:
+                self._hosts[self._host]()
+
+        return _unregister
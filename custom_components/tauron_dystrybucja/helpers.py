@@ -0,0 +1,12 @@
+"""Small helpers shared by the coordinator, the entities and the flows."""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+from .const import CONF_CITY_NAME, CONF_HOUSE_NO, CONF_STREET_NAME
+
+
+def format_address(data: Mapping[str, Any]) -> str:
+    """Human-readable address of an entry, as shown on the device."""
+    return f"{data[CONF_CITY_NAME]}, {data[CONF_STREET_NAME]} {data[CONF_HOUSE_NO]}"
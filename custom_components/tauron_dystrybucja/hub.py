@@ -0,0 +1,131 @@
+"""Hub entries: many addresses under one entry, refreshed as one batch.
+
+Each address of a hub still has its own TauronOutageCoordinator, so its
+entities, archive, statistics and feed work exactly as for a single-address
+entry. None of them keeps a timer, though: the hub refreshes them all on one
+schedule, a bounded number at a time, and publishes their snapshots together.
+Addresses are added and removed in place, without reloading the entry or
+touching the other addresses.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .archive import async_get_archive
+from .const import (
+    CONF_ADDRESSES,
+    CONF_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    HUB_CONCURRENCY,
+)
+from .coordinator import TauronOutageCoordinator
+from .fleet import async_get_fleet
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def is_hub(entry: ConfigEntry) -> bool:
+    """Whether an entry holds a list of addresses rather than being one."""
+    return CONF_ADDRESSES in entry.data
+
+
+def signal_address_added(entry_id: str) -> str:
+    """Dispatcher signal carrying the coordinator of an address new to a hub."""
+    return f"{DOMAIN}_address_added_{entry_id}"
+
+
+class TauronHubCoordinator(DataUpdateCoordinator[dict[str, dict[str, Any] | None]]):
+    """Refreshes every address of a hub entry as one batch.
+
+    The data is the latest snapshot of each address, by address id. An address
+    that fails is reported unavailable on its own; the hub fails only when none
+    of its addresses could be refreshed.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        minutes = entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+        super().__init__(
+            hass,
+            _LOGGER,
+            config_entry=entry,
+            name=f"{DOMAIN} {entry.title}",
+            update_interval=timedelta(minutes=minutes),
+        )
+        self.entry = entry
+        # What the addresses were built with; anything else changing in the
+        # options means a reload.
+        self.options = dict(entry.options)
+        self.addresses: dict[str, TauronOutageCoordinator] = {}
+        self._semaphore = asyncio.Semaphore(HUB_CONCURRENCY)
+        self._sync_lock = asyncio.Lock()
+
+    async def _async_setup(self) -> None:
+        for address_id in self.entry.data[CONF_ADDRESSES]:
+            await self._async_create(address_id)
+
+    async def _async_update_data(self) -> dict[str, dict[str, Any] | None]:
+        addresses = list(self.addresses.values())
+        await asyncio.gather(
+            *(self._async_refresh_address(address) for address in addresses)
+        )
+        if addresses and not any(address.last_update_success for address in addresses):
+            raise UpdateFailed(
+                f"None of the {len(addresses)} addresses could be refreshed"
+            )
+        return {address.address_id: address.data for address in addresses}
+
+    async def _async_refresh_address(
+        self, coordinator: TauronOutageCoordinator
+    ) -> None:
+        async with self._semaphore:
+            await coordinator.async_refresh()
+
+    async def _async_create(self, address_id: str) -> TauronOutageCoordinator:
+        coordinator = TauronOutageCoordinator(self.hass, self.entry, address_id)
+        await coordinator.statistics.async_load()
+        self.addresses[address_id] = coordinator
+        return coordinator
+
+    async def async_sync_addresses(self) -> None:
+        """Bring the running addresses in line with the entry.
+
+        New addresses are refreshed at once and announced to the platforms;
+        removed ones take their device, entities and stored history with them.
+        """
+        async with self._sync_lock:
+            wanted = self.entry.data[CONF_ADDRESSES]
+            for address_id in self.addresses.keys() - wanted.keys():
+                await self._async_remove(address_id)
+            for address_id in wanted.keys() - self.addresses.keys():
+                coordinator = await self._async_create(address_id)
+                await self._async_refresh_address(coordinator)
+                self.hass.data.setdefault(DOMAIN, {})[address_id] = coordinator
+                async_dispatcher_send(
+                    self.hass, signal_address_added(self.entry.entry_id), coordinator
+                )
+
+    async def _async_remove(self, address_id: str) -> None:
+        coordinator = self.addresses.pop(address_id)
+        self.hass.data[DOMAIN].pop(address_id, None)
+        async_get_fleet(self.hass).async_remove_entry(address_id)
+        await coordinator.async_shutdown()
+
+        # Removing the device removes its entities along with it.
+        device_registry = dr.async_get(self.hass)
+        device = device_registry.async_get_device(identifiers={(DOMAIN, address_id)})
+        if device is not None:
+            device_registry.async_update_device(
+                device.id, remove_config_entry_id=self.entry.entry_id
+            )
+        await async_get_archive(self.hass).async_remove_entry(address_id)
+        await coordinator.statistics.async_remove()
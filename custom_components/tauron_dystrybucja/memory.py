@@ -0,0 +1,119 @@
+"""Approximate memory retained by each address, for diagnostics.
+
+Sizes are sys.getsizeof summed over everything reachable from a structure, with
+each object counted once per address: an object shared by two structures - an
+outage dict held both by the snapshot and by the index, say - is charged to the
+first one measured. Message strings are measured first so they are reported on
+their own rather than hidden inside the outages.
+"""
+from __future__ import annotations
+
+import sys
+from types import MappingProxyType
+from typing import Any
+
+from homeassistant.core import HomeAssistant, State, callback
+from homeassistant.helpers import entity_registry as er
+
+from .const import DOMAIN
+from .coordinator import TauronOutageCoordinator
+from .fleet import async_get_fleet
+
+_CONTAINERS = (list, tuple, set, frozenset)
+
+
+def _sizeof(obj: Any, seen: set[int]) -> int:
+    """Deep size of an object, skipping anything already in seen.
+
+    Only containers and this integration's own objects are followed, so a
+    reference to Home Assistant itself is never walked.
+    """
+    total = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, (dict, MappingProxyType)):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, _CONTAINERS):
+            stack.extend(item)
+        elif type(item).__module__.startswith(__package__):
+            if hasattr(item, "__dict__"):
+                stack.append(vars(item))
+            for slot in getattr(type(item), "__slots__", ()):
+                if hasattr(item, slot):
+                    stack.append(getattr(item, slot))
+    return total
+
+
+def _address_memory(
+    coordinator: TauronOutageCoordinator, states: list[State]
+) -> dict[str, int]:
+    """Bytes retained by one address, per structure and in total."""
+    seen: set[int] = set()
+    outages = (coordinator.data or {}).get("outages", [])
+    sizes = {
+        "messages": sum(_sizeof(outage["message"], seen) for outage in outages),
+    }
+    for name, retained in coordinator.retained().items():
+        sizes[name] = _sizeof(retained, seen)
+    # What the entities leave behind in the state machine.
+    sizes["state_attributes"] = sum(_sizeof(state.attributes, seen) for state in states)
+    sizes["total"] = sum(sizes.values())
+    return sizes
+
+
+def _states_by_address(
+    hass: HomeAssistant, coordinators: dict[str, TauronOutageCoordinator]
+) -> dict[str, list[State]]:
+    """The entity states of every address, from one pass over each entry.
+
+    A hub's entities belong to one entry, so they are told apart by their
+    unique id, which starts with the address id.
+    """
+    registry = er.async_get(hass)
+    states: dict[str, list[State]] = {}
+    entry_ids = {coordinator.entry.entry_id for coordinator in coordinators.values()}
+    for entry_id in entry_ids:
+        for registry_entry in er.async_entries_for_config_entry(registry, entry_id):
+            address_id = registry_entry.unique_id.partition("-")[0]
+            if address_id not in coordinators:
+                continue
+            if (state := hass.states.get(registry_entry.entity_id)) is not None:
+                states.setdefault(address_id, []).append(state)
+    return states
+
+
+@callback
+def async_address_memory(hass: HomeAssistant) -> dict[str, dict[str, int]]:
+    """Bytes retained by every address, per structure and in total."""
+    coordinators: dict[str, TauronOutageCoordinator] = hass.data.get(DOMAIN, {})
+    states = _states_by_address(hass, coordinators)
+    return {
+        address_id: _address_memory(coordinator, states.get(address_id, []))
+        for address_id, coordinator in coordinators.items()
+    }
+
+
+@callback
+def async_integration_memory(
+    hass: HomeAssistant, per_address: dict[str, dict[str, int]]
+) -> dict[str, Any]:
+    """Total bytes retained by every address, with the total of each.
+
+    Takes what async_address_memory measured. The fleet index is shared by
+    all addresses and reported on its own.
+    """
+    per_entry = {
+        address_id: sizes["total"] for address_id, sizes in per_address.items()
+    }
+    return {
+        "entries": len(per_entry),
+        "total": sum(per_entry.values()),
+        "per_entry": per_entry,
+        "fleet_index": _sizeof(async_get_fleet(hass), set()),
+    }
@@ -0,0 +1,288 @@
+"""On-demand profiling of refresh cycles.
+
+Nothing here runs until the profile service is called: the profiler is only
+enabled for the requested number of refreshes, and the hooks that time state
+writes are instance attributes installed on the coordinators for that window
+and removed afterwards. Parsing moved to the executor is timed by such a hook
+too, since the profile cannot tell it apart from parsing on the event loop -
+older Pythons' cProfile does not see worker threads at all. Memory tracing,
+when asked for, is bounded the same way; its snapshots copy every live
+allocation, so they are taken in the executor.
+"""
+from __future__ import annotations
+
+import cProfile
+import logging
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.singleton import singleton
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Frames kept per traced allocation, and allocation sites reported.
+_TRACE_FRAMES = 1
+_TOP_ALLOCATIONS = 15
+
+DATA_PROFILER = f"{DOMAIN}_profiler"
+
+_PACKAGE_DIR = os.path.dirname(__file__)
+
+# Phases read from the profile: (file in this package, function).
+_PROFILED_PHASES = {
+    "api_get": ("api.py", "_get"),
+    "parse_outages": ("coordinator.py", "parse_outages"),
+    "update_data": ("coordinator.py", "_async_update_data"),
+}
+
+
+@singleton(DATA_PROFILER)
+@callback
+def async_get_profiler(hass: HomeAssistant) -> RefreshProfiler:
+    """Return the profiler shared by all entries."""
+    return RefreshProfiler(hass)
+
+
+class RefreshProfiler:
+    """Profiles the next few refreshes across all entries."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._profile: cProfile.Profile | None = None
+        self._remaining = 0
+        self._refreshes = 0
+        self._started = 0.0
+        self._state_writes = 0.0
+        # Parsing done in the executor, summed from worker threads.
+        self._executor_lock = threading.Lock()
+        self._executor_parses = 0
+        self._executor_parse_time = 0.0
+        self._hooked: list[Any] = []
+        self._snapshot: tracemalloc.Snapshot | None = None
+        self._owns_tracing = False
+        # Set from the end of a run until its results are saved.
+        self._saving = False
+        self._unsub_timeout: CALLBACK_TYPE | None = None
+        # Summary of the last completed run, for diagnostics.
+        self.summary: dict[str, Any] | None = None
+
+    @property
+    def active(self) -> bool:
+        """Whether a profiling run is in progress or still being saved."""
+        return self._profile is not None or self._saving
+
+    async def async_start(
+        self,
+        coordinators: list[Any],
+        refreshes: int,
+        timeout: float,
+        trace_memory: bool = False,
+    ) -> None:
+        """Start profiling until the given number of refreshes has completed.
+
+        With trace_memory, the allocations still alive at the end that were
+        not there at the start are reported too - growth across refreshes that
+        is not given back is what a leak looks like.
+        """
+        if self.active:
+            raise HomeAssistantError("Profiling is already running")
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as err:
+            # Another profiler, such as Home Assistant's own, is active.
+            raise HomeAssistantError(f"Cannot start profiling: {err}") from err
+
+        self._profile = profile
+        self._remaining = refreshes
+        self._refreshes = 0
+        self._state_writes = 0.0
+        self._executor_parses = 0
+        self._executor_parse_time = 0.0
+        self._started = time.perf_counter()
+        if trace_memory:
+            # Tracing may already be on, e.g. through PYTHONTRACEMALLOC.
+            self._owns_tracing = not tracemalloc.is_tracing()
+            if self._owns_tracing:
+                tracemalloc.start(_TRACE_FRAMES)
+            self._snapshot = await self._hass.async_add_executor_job(
+                tracemalloc.take_snapshot
+            )
+        for coordinator in coordinators:
+            coordinator.async_update_listeners = self._wrap_listeners(
+                coordinator.async_update_listeners
+            )
+            coordinator.parse_in_executor = self._wrap_executor_parse(
+                coordinator.parse_in_executor
+            )
+            self._hooked.append(coordinator)
+        self._unsub_timeout = async_call_later(self._hass, timeout, self._async_timeout)
+        _LOGGER.info(
+            "Profiling the next %s refreshes of %s entries", refreshes, len(coordinators)
+        )
+
+    def _wrap_listeners(self, update_listeners: Callable[[], None]) -> Callable[[], None]:
+        """Time the state writes a refresh triggers, and count the refresh."""
+
+        @callback
+        def _timed_update_listeners() -> None:
+            started = time.perf_counter()
+            update_listeners()
+            self._state_writes += time.perf_counter() - started
+            self._refreshes += 1
+            self._remaining -= 1
+            if self._remaining == 0:
+                # Let the rest of this loop iteration finish inside the profile.
+                self._hass.loop.call_soon(self._async_stop)
+
+        return _timed_update_listeners
+
+    def _wrap_executor_parse(
+        self, parse: Callable[[dict[str, Any]], list[dict[str, Any]]]
+    ) -> Callable[[dict[str, Any]], list[dict[str, Any]]]:
+        """Time parsing in the executor, on its own."""
+
+        def _timed_parse(raw: dict[str, Any]) -> list[dict[str, Any]]:
+            started = time.perf_counter()
+            try:
+                return parse(raw)
+            finally:
+                elapsed = time.perf_counter() - started
+                with self._executor_lock:
+                    self._executor_parses += 1
+                    self._executor_parse_time += elapsed
+
+        return _timed_parse
+
+    @callback
+    def _async_timeout(self, _now: datetime) -> None:
+        self._unsub_timeout = None
+        _LOGGER.info("Profiling timed out after %s refreshes", self._refreshes)
+        self._async_stop()
+
+    @callback
+    def _async_stop(self) -> None:
+        profile = self._profile
+        if profile is None:
+            return
+        profile.disable()
+        self._profile = None
+        if self._unsub_timeout is not None:
+            self._unsub_timeout()
+            self._unsub_timeout = None
+        for coordinator in self._hooked:
+            # Drop the instance attributes so the class methods show through.
+            coordinator.__dict__.pop("async_update_listeners", None)
+            coordinator.__dict__.pop("parse_in_executor", None)
+        self._hooked = []
+        before, owns_tracing = self._snapshot, self._owns_tracing
+        self._snapshot = None
+        self._owns_tracing = False
+        self._saving = True
+
+        path = self._hass.config.path(
+            f"{DOMAIN}_profile_{dt_util.now().strftime('%Y%m%d_%H%M%S')}.prof"
+        )
+        with self._executor_lock:
+            executor_parse = {
+                "calls": self._executor_parses,
+                "total_ms": round(self._executor_parse_time * 1000, 3),
+            }
+        summary = {
+            "finished": dt_util.now().isoformat(),
+            "refreshes": self._refreshes,
+            "duration_s": round(time.perf_counter() - self._started, 3),
+            "file": path,
+            "phases": {
+                "parse_outages_executor": executor_parse,
+                "state_writes": {"total_ms": round(self._state_writes * 1000, 3)},
+            },
+        }
+        self._hass.async_create_task(
+            self._async_save(profile, path, summary, before, owns_tracing)
+        )
+
+    async def _async_save(
+        self,
+        profile: cProfile.Profile,
+        path: str,
+        summary: dict[str, Any],
+        before: tracemalloc.Snapshot | None,
+        owns_tracing: bool,
+    ) -> None:
+        try:
+            if before is not None:
+                after = await self._hass.async_add_executor_job(
+                    tracemalloc.take_snapshot
+                )
+                if owns_tracing:
+                    tracemalloc.stop()
+                summary["memory"] = await self._hass.async_add_executor_job(
+                    _compare_snapshots, before, after
+                )
+            summary["phases"].update(
+                await self._hass.async_add_executor_job(_write_profile, profile, path)
+            )
+        finally:
+            self._saving = False
+        self.summary = summary
+        _LOGGER.info("Wrote refresh profile to %s", path)
+
+
+def _write_profile(profile: cProfile.Profile, path: str) -> dict[str, Any]:
+    """Save the profile and sum it up per phase.
+
+    Coroutines are counted once per resumption, and their times only cover the
+    stretches they actually ran on the event loop - which is the point.
+    """
+    profile.dump_stats(path)
+    stats = pstats.Stats(profile).stats  # type: ignore[attr-defined]
+    phases: dict[str, Any] = {}
+    for phase, (filename, function) in _PROFILED_PHASES.items():
+        calls = 0
+        own = total = 0.0
+        for (file, _line, name), (_cc, ncalls, tottime, cumtime, _callers) in stats.items():
+            if name == function and file == os.path.join(_PACKAGE_DIR, filename):
+                calls += ncalls
+                own += tottime
+                total += cumtime
+        phases[phase] = {
+            "calls": calls,
+            "own_ms": round(own * 1000, 3),
+            "total_ms": round(total * 1000, 3),
+        }
+    return phases
+
+
+def _compare_snapshots(
+    before: tracemalloc.Snapshot, after: tracemalloc.Snapshot
+) -> dict[str, Any]:
+    """Sum up the growth between two snapshots, largest allocation sites first."""
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    differences = after.filter_traces(ignore).compare_to(
+        before.filter_traces(ignore), "lineno"
+    )
+    return {
+        "growth_kib": round(sum(diff.size_diff for diff in differences) / 1024, 1),
+        "top": [
+            {
+                "site": f"{diff.traceback[0].filename}:{diff.traceback[0].lineno}",
+                "size_kib": round(diff.size_diff / 1024, 1),
+                "count": diff.count_diff,
+            }
+            for diff in differences[:_TOP_ALLOCATIONS]
+            if diff.size_diff > 0
+        ],
+    }
@@ -1,6 +1,7 @@
 """Sensor platform for Tauron Dystrybucja."""
 from __future__ import annotations
 
+from collections.abc import Mapping
 from datetime import datetime
 from typing import Any
 
@@ -10,19 +11,17 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.const import UnitOfTime
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
 
 from . import TauronConfigEntry
+from .const import DOMAIN
 from .coordinator import TauronOutageCoordinator
-from .entity import TauronEntity
-
-# Home Assistant rejects states longer than this.
-MAX_STATE_LENGTH = 255
-
-STATUS_NONE = "none"
-STATUS_UPCOMING = "upcoming"
-STATUS_ONGOING = "ongoing"
+from .entity import TauronEntity, async_setup_address_entities
+from .fleet import FleetIndex, async_get_fleet
+from .view import STATUS_NONE, STATUS_ONGOING, STATUS_UPCOMING
 
 
 async def async_setup_entry(
@@ -31,16 +30,31 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Tauron sensors from a config entry."""
-    coordinator = entry.runtime_data
-    async_add_entities(
-        [
+    async_setup_address_entities(
+        hass,
+        entry,
+        async_add_entities,
+        lambda coordinator: [
             TauronStatusSensor(coordinator),
             TauronNextOutageSensor(coordinator),
             TauronNextOutageEndSensor(coordinator),
             TauronNextOutageDurationSensor(coordinator),
             TauronNextOutageDescriptionSensor(coordinator),
             TauronOutageCountSensor(coordinator),
-        ]
+            TauronMonthlyOutageHoursSensor(coordinator),
+            TauronQuarterlyOutageCountSensor(coordinator),
+            TauronMeanOutageDurationSensor(coordinator),
+        ],
+    )
+
+    # One sensor covers every address; whichever entry hosts it, this one can
+    # take it over.
+    fleet = async_get_fleet(hass)
+    entry.async_on_unload(
+        fleet.async_register_host(
+            entry.entry_id,
+            lambda: async_add_entities([TauronAffectedAddressesSensor(fleet)]),
+        )
     )
 
 
@@ -48,21 +62,9 @@ class TauronRelevantOutageEntity(TauronEntity, SensorEntity):
     """Base for sensors describing the ongoing outage, or the next one."""
 
     @property
-    def _outage(self) -> dict[str, Any] | None:
-        data = self.coordinator.data
-        return data["current"] or data["next"]
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
+    def extra_state_attributes(self) -> Mapping[str, Any]:
         """Expose the outage as flat attributes, usable without templates."""
-        outage = self._outage
-        if not outage:
-            return {}
-        return {
-            "start": outage["start"],
-            "end": outage["end"],
-            "description": outage["message"],
-        }
+        return self._view.relevant_attributes
 
 
 class TauronStatusSensor(TauronEntity, SensorEntity):
@@ -78,12 +80,7 @@ class TauronStatusSensor(TauronEntity, SensorEntity):
 
     @property
     def native_value(self) -> str:
-        data = self.coordinator.data
-        if data["current"]:
-            return STATUS_ONGOING
-        if data["next"]:
-            return STATUS_UPCOMING
-        return STATUS_NONE
+        return self._view.status
 
 
 class TauronNextOutageSensor(TauronRelevantOutageEntity):
@@ -98,8 +95,7 @@ class TauronNextOutageSensor(TauronRelevantOutageEntity):
 
     @property
     def native_value(self) -> datetime | None:
-        outage = self._outage
-        return outage["start"] if outage else None
+        return self._view.start
 
 
 class TauronNextOutageEndSensor(TauronRelevantOutageEntity):
@@ -114,8 +110,7 @@ class TauronNextOutageEndSensor(TauronRelevantOutageEntity):
 
     @property
     def native_value(self) -> datetime | None:
-        outage = self._outage
-        return outage["end"] if outage else None
+        return self._view.end
 
 
 class TauronNextOutageDurationSensor(TauronRelevantOutageEntity):
@@ -132,10 +127,7 @@ class TauronNextOutageDurationSensor(TauronRelevantOutageEntity):
 
     @property
     def native_value(self) -> float | None:
-        outage = self._outage
-        if not outage or not outage["start"] or not outage["end"]:
-            return None
-        return (outage["end"] - outage["start"]).total_seconds() / 3600
+        return self._view.duration
 
 
 class TauronNextOutageDescriptionSensor(TauronRelevantOutageEntity):
@@ -153,23 +145,11 @@ class TauronNextOutageDescriptionSensor(TauronRelevantOutageEntity):
 
     @property
     def native_value(self) -> str | None:
-        outage = self._outage
-        if not outage:
-            return None
-        message = outage["message"] or ""
-        if len(message) <= MAX_STATE_LENGTH:
-            return message
-        # Descriptions occasionally exceed the state limit; the untruncated text
-        # stays available in the full_message attribute.
-        return f"{message[: MAX_STATE_LENGTH - 1]}…"
+        return self._view.description
 
     @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        attributes = super().extra_state_attributes
-        outage = self._outage
-        if outage:
-            attributes["full_description"] = outage["message"]
-        return attributes
+    def extra_state_attributes(self) -> Mapping[str, Any]:
+        return self._view.description_attributes
 
 
 class TauronOutageCountSensor(TauronEntity, SensorEntity):
@@ -184,17 +164,108 @@ class TauronOutageCountSensor(TauronEntity, SensorEntity):
 
     @property
     def native_value(self) -> int:
-        return len(self.coordinator.data["outages"])
+        return self._view.count
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any]:
+        return self._view.list_attributes
+
+
+class TauronMonthlyOutageHoursSensor(TauronEntity, SensorEntity):
+    """Hours of outages starting this month, including announced ones.
+
+    Long-term history of this value is imported as an external statistic, so
+    the sensor itself has no state class.
+    """
+
+    _attr_translation_key = "monthly_outage_hours"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.HOURS
+    _attr_suggested_display_precision = 1
+    _attr_icon = "mdi:calendar-month"
+
+    def __init__(self, coordinator: TauronOutageCoordinator) -> None:
+        super().__init__(coordinator, "monthly_outage_hours")
+
+    @property
+    def native_value(self) -> float:
+        return self.coordinator.statistics.hours_this_month
+
+
+class TauronQuarterlyOutageCountSensor(TauronEntity, SensorEntity):
+    """Number of outages starting this quarter, including announced ones."""
+
+    _attr_translation_key = "quarterly_outage_count"
+    _attr_icon = "mdi:counter"
+
+    def __init__(self, coordinator: TauronOutageCoordinator) -> None:
+        super().__init__(coordinator, "quarterly_outage_count")
+
+    @property
+    def native_value(self) -> int:
+        return self.coordinator.statistics.count_this_quarter
+
+
+class TauronMeanOutageDurationSensor(TauronEntity, SensorEntity):
+    """Mean announced duration of every outage seen so far."""
+
+    _attr_translation_key = "mean_outage_duration"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.HOURS
+    _attr_suggested_display_precision = 1
+    _attr_icon = "mdi:timer-sand"
+
+    def __init__(self, coordinator: TauronOutageCoordinator) -> None:
+        super().__init__(coordinator, "mean_outage_duration")
 
     @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        return {
-            "outages": [
-                {
-                    "description": outage["message"],
-                    "start": outage["start"],
-                    "end": outage["end"],
-                }
-                for outage in self.coordinator.data["outages"]
-            ]
-        }
+    def native_value(self) -> float | None:
+        return self.coordinator.statistics.mean_duration
+
+
+class TauronAffectedAddressesSensor(SensorEntity):
+    """Number of addresses with an outage in progress, across all entries.
+
+    Updated when any address refreshes and at the moments outages start and
+    end, straight from the fleet index.
+    """
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_translation_key = "affected_addresses"
+    _attr_unique_id = f"{DOMAIN}_affected_addresses"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:home-lightning-bolt"
+
+    def __init__(self, fleet: FleetIndex) -> None:
+        self._fleet = fleet
+        self._unsub_timer: CALLBACK_TYPE | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the fleet index."""
+        self.async_on_remove(self._fleet.async_add_listener(self._async_update))
+        self.async_on_remove(self._async_cancel_timer)
+        self._async_update(write=False)
+
+    @callback
+    def _async_cancel_timer(self) -> None:
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    @callback
+    def _async_update(self, _now: datetime | None = None, write: bool = True) -> None:
+        now = dt_util.utcnow().timestamp()
+        value = len(self._fleet.query(now, now))
+
+        self._async_cancel_timer()
+        if (change := self._fleet.next_change(now)) is not None:
+            self._unsub_timer = async_track_point_in_utc_time(
+                self.hass, self._async_update, dt_util.utc_from_timestamp(change)
+            )
+
+        # Most refreshes change nothing here.
+        changed = value != self._attr_native_value
+        self._attr_native_value = value
+        if changed and write:
+            self.async_write_ha_state()
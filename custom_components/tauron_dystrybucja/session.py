@@ -0,0 +1,120 @@
+"""HTTP session dedicated to the Tauron API host.
+
+Every address talks to the same host, so the integration keeps its own small
+connection pool instead of borrowing Home Assistant's general-purpose one: a
+bounded number of kept-alive connections, cached DNS and compressed responses.
+
+Requests wait for a free connection on a semaphore of the pool's size rather
+than inside aiohttp, which would count the wait against the connect timeout and
+fail requests that merely queued behind hundreds of others.
+"""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict, dataclass
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+from aiohttp import hdrs
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE
+from homeassistant.helpers.singleton import singleton
+from homeassistant.util import ssl as ssl_util
+
+from .const import (
+    DNS_CACHE_TTL,
+    DOMAIN,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_POOL_SIZE,
+)
+
+try:
+    from aiohttp.compression_utils import HAS_BROTLI
+except ImportError:
+    HAS_BROTLI = False
+
+DATA_SESSION = f"{DOMAIN}_session"
+
+# aiohttp only decodes Brotli when a Brotli module is installed.
+ACCEPT_ENCODING = "gzip, deflate, br" if HAS_BROTLI else "gzip, deflate"
+
+
+@dataclass(slots=True)
+class TauronHttpStats:
+    """Counters describing how well connections are reused."""
+
+    requests: int = 0
+    connections_created: int = 0
+    connections_reused: int = 0
+    # What the server sent, taken from Content-Length; chunked responses
+    # have none and are only counted in bytes_decoded.
+    bytes_on_wire: int = 0
+    # Response bodies after decompression.
+    bytes_decoded: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters, plus the reuse ratio, for diagnostics."""
+        data = asdict(self)
+        connections = self.connections_created + self.connections_reused
+        data["reuse_ratio"] = (
+            round(self.connections_reused / connections, 3) if connections else None
+        )
+        data["accept_encoding"] = ACCEPT_ENCODING
+        return data
+
+
+class TauronSession:
+    """The pooled ClientSession together with its statistics.
+
+    A request holds one of the slots for as long as it uses a connection.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, stats: TauronHttpStats) -> None:
+        self.session = session
+        self.stats = stats
+        self.slots = asyncio.Semaphore(HTTP_POOL_SIZE)
+
+
+@singleton(DATA_SESSION)
+@callback
+def async_get_session(hass: HomeAssistant) -> TauronSession:
+    """Return the session shared by all entries, creating it on first use."""
+    stats = TauronHttpStats()
+
+    async def _on_create(
+        _session: aiohttp.ClientSession, _ctx: SimpleNamespace, _params: Any
+    ) -> None:
+        stats.connections_created += 1
+
+    async def _on_reuse(
+        _session: aiohttp.ClientSession, _ctx: SimpleNamespace, _params: Any
+    ) -> None:
+        stats.connections_reused += 1
+
+    trace = aiohttp.TraceConfig()
+    trace.on_connection_create_end.append(_on_create)
+    trace.on_connection_reuseconn.append(_on_reuse)
+
+    session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=HTTP_POOL_SIZE,
+            limit_per_host=HTTP_POOL_SIZE,
+            ttl_dns_cache=DNS_CACHE_TTL,
+            keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+            ssl=ssl_util.get_default_context(),
+        ),
+        headers={
+            hdrs.USER_AGENT: SERVER_SOFTWARE,
+            hdrs.ACCEPT_ENCODING: ACCEPT_ENCODING,
+        },
+        trace_configs=[trace],
+    )
+
+    @callback
+    def _async_close(_event: Event) -> None:
+        hass.async_create_task(session.close())
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close)
+    return TauronSession(session, stats)
@@ -0,0 +1,294 @@
+"""Running outage statistics for one address.
+
+The totals are kept up to date from what changed between two refreshes, so a
+refresh costs time in proportion to the changes, never to the history. They are
+persisted, exposed as sensors and pushed to the recorder as external long-term
+statistics.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+)
+from homeassistant.const import UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+try:
+    from homeassistant.components.recorder.models import StatisticMeanType
+except ImportError:  # Home Assistant < 2025.4
+    StatisticMeanType = None
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 30
+
+
+def _month(start: datetime) -> str:
+    return dt_util.as_local(start).strftime("%Y-%m")
+
+
+def _quarter(start: datetime) -> str:
+    local = dt_util.as_local(start)
+    return f"{local.year}-Q{(local.month - 1) // 3 + 1}"
+
+
+def _month_start(period: str) -> datetime:
+    year, month = period.split("-")
+    return dt_util.start_of_local_day(datetime(int(year), int(month), 1))
+
+
+def _quarter_start(period: str) -> datetime:
+    year, quarter = period.split("-Q")
+    return dt_util.start_of_local_day(
+        datetime(int(year), (int(quarter) - 1) * 3 + 1, 1)
+    )
+
+
+def _hours(start: datetime | None, end: datetime | None) -> float | None:
+    if not start or not end:
+        return None
+    return (end - start).total_seconds() / 3600
+
+
+class TauronOutageStatistics:
+    """Outage hours per month, outages per quarter and mean announced duration.
+
+    Every outage is counted once, when it is first seen, under the month and
+    quarter it starts in. An outage that disappears before it ends was
+    cancelled or moved, so it is taken back out; one that disappears after
+    ending simply happened and stays counted. Outages cancelled while Home
+    Assistant was stopped are taken back out on the first refresh.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, title: str) -> None:
+        self._hass = hass
+        self._entry_id = entry_id
+        self._title = title
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.statistics.{entry_id}"
+        )
+        self.monthly_hours: dict[str, float] = {}
+        self.quarterly_count: dict[str, int] = {}
+        self._timed_count = 0
+        self._timed_hours = 0.0
+        # Counted outages that could still be cancelled, with the times they
+        # were counted under, so taking one back is exact.
+        self._pending: dict[str, tuple[float | None, float | None]] = {}
+        # Set when outages restored from storage still have to be checked
+        # against the first refresh.
+        self._reconcile = False
+        # Set while a delayed save is outstanding.
+        self._unsaved = False
+
+    async def async_load(self) -> None:
+        """Restore the totals saved by a previous run."""
+        stored = await self._store.async_load()
+        if not stored:
+            return
+        self.monthly_hours = stored["monthly_hours"]
+        self.quarterly_count = stored["quarterly_count"]
+        self._timed_count = stored["timed_count"]
+        self._timed_hours = stored["timed_hours"]
+        # Outages that ended while Home Assistant was stopped will never be
+        # reported as removed, so they are settled here.
+        now_ts = dt_util.utcnow().timestamp()
+        self._pending = {
+            key: (start_ts, end_ts)
+            for key, (start_ts, end_ts) in stored["pending"].items()
+            if end_ts is None or end_ts > now_ts
+        }
+        self._reconcile = bool(self._pending)
+
+    async def async_flush(self) -> None:
+        """Write out a delayed save now, before the entry unloads.
+
+        A new instance built within the delay would otherwise load the stale
+        file and count again what this one had already counted.
+        """
+        if not self._unsaved:
+            return
+        self._unsaved = False
+        # Saving cancels the delayed write.
+        await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self) -> None:
+        """Delete the saved totals and long-term statistics of a removed address."""
+        await self._store.async_remove()
+        if "recorder" in self._hass.config.components:
+            get_instance(self._hass).async_clear_statistics(
+                [self._statistic_id(kind) for kind in ("outage_hours", "outage_count")]
+            )
+
+    @property
+    def hours_this_month(self) -> float:
+        """Hours of outages starting in the current month."""
+        return self.monthly_hours.get(_month(dt_util.now()), 0.0)
+
+    @property
+    def count_this_quarter(self) -> int:
+        """Number of outages starting in the current quarter."""
+        return self.quarterly_count.get(_quarter(dt_util.now()), 0)
+
+    @property
+    def mean_duration(self) -> float | None:
+        """Mean announced duration in hours, over every outage with both times."""
+        if not self._timed_count:
+            return None
+        return self._timed_hours / self._timed_count
+
+    def retained(self) -> tuple[Any, ...]:
+        """The structures kept in memory, for diagnostics."""
+        return (self.monthly_hours, self.quarterly_count, self._pending)
+
+    @callback
+    def async_apply(
+        self,
+        added: list[dict[str, Any]],
+        removed: list[dict[str, Any]],
+        now: datetime,
+    ) -> None:
+        """Fold one refresh worth of changes into the totals."""
+        changed: set[str] = set()
+        now_ts = now.timestamp()
+        appeared = {outage["key"] for outage in added}
+
+        for outage in removed:
+            # A key that also appeared was extended or shortened in place; it
+            # is recounted below rather than taken back.
+            if outage["key"] not in appeared:
+                changed |= self._take_back(outage["key"], now_ts)
+
+        for outage in added:
+            start = outage["start"]
+            end = outage["end"]
+            times = (
+                start.timestamp() if start else None,
+                end.timestamp() if end else None,
+            )
+            counted = self._pending.get(outage["key"])
+            if counted == times:
+                # Counted before a restart.
+                continue
+            if counted is not None:
+                # Counted under other times, so its end moved.
+                changed |= self._uncount(counted)
+            self._pending[outage["key"]] = times
+            changed |= self._count(start, end, 1)
+
+        stale: set[str] = set()
+        if self._reconcile:
+            # The first refresh lists every outage, so whatever was counted
+            # before a restart and is missing now was cancelled meanwhile.
+            self._reconcile = False
+            stale = self._pending.keys() - appeared
+            for key in stale:
+                changed |= self._take_back(key, now_ts)
+
+        if added or removed or stale:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+            self._unsaved = True
+        if changed:
+            self._async_import(changed)
+
+    def _take_back(self, key: str, now_ts: float) -> set[str]:
+        """Uncount an outage that disappeared, unless it had already ended."""
+        times = self._pending.pop(key, None)
+        if times is None or (times[1] is not None and times[1] <= now_ts):
+            return set()
+        return self._uncount(times)
+
+    def _uncount(self, times: tuple[float | None, float | None]) -> set[str]:
+        """Take back an outage counted under the given times."""
+        start_ts, end_ts = times
+        start = dt_util.utc_from_timestamp(start_ts) if start_ts is not None else None
+        end = dt_util.utc_from_timestamp(end_ts) if end_ts is not None else None
+        return self._count(start, end, -1)
+
+    def _count(self, start: datetime | None, end: datetime | None, sign: int) -> set[str]:
+        """Add (or take back) one outage, returning the periods it touched."""
+        if not start:
+            return set()
+        month = _month(start)
+        quarter = _quarter(start)
+        self.quarterly_count[quarter] = self.quarterly_count.get(quarter, 0) + sign
+        hours = _hours(start, end)
+        if hours is not None:
+            self.monthly_hours[month] = self.monthly_hours.get(month, 0.0) + sign * hours
+            self._timed_count += sign
+            self._timed_hours += sign * hours
+        return {month, quarter}
+
+    def _statistic_id(self, kind: str) -> str:
+        return f"{DOMAIN}:{kind}_{self._entry_id.lower()}"
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {
+            "monthly_hours": self.monthly_hours,
+            "quarterly_count": self.quarterly_count,
+            "timed_count": self._timed_count,
+            "timed_hours": self._timed_hours,
+            "pending": {key: list(times) for key, times in self._pending.items()},
+        }
+
+    @callback
+    def _async_import(self, changed: set[str]) -> None:
+        """Push the periods from the earliest changed one onwards to the recorder.
+
+        The running sum of every later period moves with an earlier change, so
+        those are re-imported too. Periods are months and quarters, so this is a
+        handful of rows.
+        """
+        if "recorder" not in self._hass.config.components:
+            return
+
+        for kind, values, period_start, unit, name in (
+            (
+                "outage_hours",
+                self.monthly_hours,
+                _month_start,
+                UnitOfTime.HOURS,
+                f"{self._title} outage hours",
+            ),
+            (
+                "outage_count",
+                self.quarterly_count,
+                _quarter_start,
+                None,
+                f"{self._title} outages",
+            ),
+        ):
+            periods = sorted(values)
+            first = min((p for p in periods if p in changed), default=None)
+            if first is None:
+                continue
+            total = 0.0
+            rows = []
+            for period in periods:
+                total += values[period]
+                if period >= first:
+                    rows.append(
+                        {
+                            "start": period_start(period),
+                            "state": values[period],
+                            "sum": total,
+                        }
+                    )
+            metadata: dict[str, Any] = {
+                "has_sum": True,
+                "name": name,
+                "source": DOMAIN,
+                "statistic_id": self._statistic_id(kind),
+                "unit_of_measurement": unit,
+            }
+            if StatisticMeanType is not None:
+                metadata["mean_type"] = StatisticMeanType.NONE
+            else:
+                metadata["has_mean"] = False
+            async_add_external_statistics(self._hass, metadata, rows)
@@ -0,0 +1,128 @@
+"""What the entities of one address show, derived once per snapshot.
+
+Entity properties are read on every state write, and again by the recorder.
+Deriving them from the coordinator data each time meant re-picking the relevant
+outage, re-truncating the description and rebuilding the outage list over and
+over; the view does it once, when the data changes, and every entity of the
+address reads from it.
+"""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any
+
+# Home Assistant rejects states longer than this.
+MAX_STATE_LENGTH = 255
+
+STATUS_NONE = "none"
+STATUS_UPCOMING = "upcoming"
+STATUS_ONGOING = "ongoing"
+
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+# What an address shows before its first successful refresh.
+_NO_DATA: Mapping[str, Any] = MappingProxyType(
+    {"current": None, "next": None, "outages": []}
+)
+
+
+@dataclass(frozen=True, slots=True)
+class OutageView:
+    """Immutable entity state of one address.
+
+    The attribute mappings are read-only and shared by every read; Home
+    Assistant copies them into the state, so handing out the same one is safe.
+    """
+
+    status: str
+    ongoing: bool
+    start: datetime | None
+    end: datetime | None
+    duration: float | None
+    description: str | None
+    count: int
+    # The relevant outage - ongoing, or else the next one - as attributes.
+    relevant_attributes: Mapping[str, Any]
+    description_attributes: Mapping[str, Any]
+    # The ongoing outage only.
+    ongoing_attributes: Mapping[str, Any]
+    list_attributes: Mapping[str, Any]
+
+
+def _truncate(message: str) -> str:
+    if len(message) <= MAX_STATE_LENGTH:
+        return message
+    # Descriptions occasionally exceed the state limit; the untruncated text
+    # stays available in the full_description attribute.
+    return f"{message[: MAX_STATE_LENGTH - 1]}…"
+
+
+def build_view(data: Mapping[str, Any] | None) -> OutageView:
+    """Derive the entity state of one coordinator snapshot.
+
+    An address of a hub whose first refresh failed has no snapshot yet, and
+    shows no outages.
+    """
+    if data is None:
+        data = _NO_DATA
+    current = data["current"]
+    outage = current or data["next"]
+    outages = data["outages"]
+
+    if current:
+        status = STATUS_ONGOING
+    elif outage:
+        status = STATUS_UPCOMING
+    else:
+        status = STATUS_NONE
+
+    start = end = duration = description = None
+    relevant = description_attributes = ongoing = _EMPTY
+    if outage:
+        start = outage["start"]
+        end = outage["end"]
+        if start and end:
+            duration = (end - start).total_seconds() / 3600
+        description = _truncate(outage["message"] or "")
+        relevant = MappingProxyType(
+            {"start": start, "end": end, "description": outage["message"]}
+        )
+        description_attributes = MappingProxyType(
+            {**relevant, "full_description": outage["message"]}
+        )
+    if current:
+        ongoing = MappingProxyType(
+            {
+                "description": current["message"],
+                "start": current["start"],
+                "end": current["end"],
+            }
+        )
+
+    return OutageView(
+        status=status,
+        ongoing=current is not None,
+        start=start,
+        end=end,
+        duration=duration,
+        description=description,
+        count=len(outages),
+        relevant_attributes=relevant,
+        description_attributes=description_attributes,
+        ongoing_attributes=ongoing,
+        list_attributes=MappingProxyType(
+            {
+                "outages": [
+                    {
+                        "description": outage["message"],
+                        "start": outage["start"],
+                        "end": outage["end"],
+                    }
+                    for outage in outages
+                ]
+            }
+        ),
+    )
@@ -0,0 +1,519 @@
+"""Load test: many Tauron Dystrybucja entries on one Home Assistant instance.
+
+Starts a test Home Assistant with N synthetic config entries - or one hub
+entry holding N addresses, with --hub - polling a local fake of the Tauron API,
+fires the polling timers for a simulated period and reports what it cost:
+
+- setup time of async_setup_entry, and of the platforms on their own
+- event loop lag (how late a 10 ms sleeper wakes up), and the loop time each
+  refresh reports for itself
+- peak RSS of the process
+- state writes and API requests per second of wall time
+
+Nothing leaves the machine, so it can run offline as a regression gate: pass
+any of the --max-* thresholds and the exit status is 1 when one is exceeded.
+With --replay, the addresses are served a file written by the export_capture
+action instead of the fake, for real-world payloads.
+
+Requires Home Assistant and pytest-homeassistant-custom-component:
+
+    pip install pytest-homeassistant-custom-component
+    python scripts/load_test.py --entries 500 --hours 24 --max-loop-lag-ms 100
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import resource
+import socket
+import statistics
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from typing import Any
+
+from aiohttp import web
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from homeassistant import loader
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import EVENT_STATE_CHANGED, EVENT_STATE_REPORTED
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_test_home_assistant,
+)
+
+import custom_components.tauron_dystrybucja as integration
+from custom_components.tauron_dystrybucja import api as tauron_api
+from custom_components.tauron_dystrybucja.capture import (
+    ReplaySession,
+    load_capture,
+)
+from custom_components.tauron_dystrybucja.const import (
+    CONF_ADDRESSES,
+    CONF_CITY_GAID,
+    CONF_CITY_NAME,
+    CONF_HOUSE_NO,
+    CONF_PARSE_THRESHOLD,
+    CONF_SCAN_INTERVAL,
+    CONF_STREET_GAID,
+    CONF_STREET_NAME,
+    DEFAULT_PARSE_THRESHOLD,
+    DOMAIN,
+    ENDPOINT_OUTAGES,
+    MIN_SCAN_INTERVAL,
+)
+from custom_components.tauron_dystrybucja.session import async_get_session
+
+LAG_INTERVAL = 0.01
+
+
+class FakeTauronApi:
+    """Serves deterministic outages for any address.
+
+    Every address gets its own seeded set of outages around the current time.
+    A fraction of them move between polls, so refreshes exercise the change
+    detection and the state writes that follow, not just the happy path.
+    """
+
+    def __init__(self, outages: int, churn: float, seed: int) -> None:
+        self.requests = 0
+        self._outages = outages
+        self._churn = churn
+        self._seed = seed
+        self._runner: web.AppRunner | None = None
+
+    async def async_start(self) -> str:
+        app = web.Application()
+        app.router.add_get(ENDPOINT_OUTAGES, self._handle_outages)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+        return f"http://127.0.0.1:{port}"
+
+    async def async_stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    async def _handle_outages(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        query = request.query
+        # The integration sends local time without an offset.
+        zone = dt_util.get_default_time_zone()
+        start = dt_util.parse_datetime(query["fromDate"]).replace(tzinfo=zone)
+        end = dt_util.parse_datetime(query["toDate"]).replace(tzinfo=zone)
+        address = f"{query['cityGAID']}-{query['streetGAID']}-{query['houseNo']}"
+        rng = random.Random(f"{self._seed}-{address}")
+        churn = random.Random(f"{self._seed}-{address}-{self.requests}")
+        base = dt_util.start_of_local_day()
+        now = dt_util.now()
+
+        items = []
+        for index in range(self._outages):
+            outage_start = base + timedelta(
+                days=rng.randint(-1, 29), hours=rng.choice((7, 8, 9, 10, 12))
+            )
+            outage_end = outage_start + timedelta(hours=rng.choice((2, 4, 6, 8)))
+            if churn.random() < self._churn:
+                outage_end += timedelta(hours=1)
+            if not start <= outage_start <= end:
+                continue
+            items.append(
+                {
+                    "OutageId": rng.randint(1, 10**9) + index,
+                    "StartDate": outage_start.isoformat(),
+                    "EndDate": outage_end.isoformat(),
+                    "Message": (
+                        "Planowane prace sieciowe. Wyłączenie obejmie ulice: "
+                        + ", ".join(
+                            f"Ulica {rng.randint(1, 500)}"
+                            for _ in range(rng.randint(3, 25))
+                        )
+                        + "."
+                    ),
+                    "TypeId": 1,
+                    "IsActive": outage_start <= now <= outage_end,
+                }
+            )
+        return web.json_response({"OutageItems": items})
+
+
+def _address(index: int) -> dict[str, Any]:
+    return {
+        CONF_CITY_NAME: "Miasto",
+        CONF_CITY_GAID: 1000 + index,
+        CONF_STREET_NAME: "Ulica Testowa",
+        CONF_STREET_GAID: 2000 + index,
+        CONF_HOUSE_NO: str(index),
+    }
+
+
+def _entries(
+    count: int, scan_interval: int, parse_threshold: int, hub: bool = False
+) -> list[MockConfigEntry]:
+    options = {
+        CONF_SCAN_INTERVAL: scan_interval,
+        CONF_PARSE_THRESHOLD: parse_threshold,
+    }
+    if hub:
+        return [
+            MockConfigEntry(
+                domain=DOMAIN,
+                version=2,
+                title="Hub",
+                data={
+                    CONF_ADDRESSES: {
+                        f"address{index}": _address(index) for index in range(count)
+                    }
+                },
+                options=options,
+            )
+        ]
+    return [
+        MockConfigEntry(
+            domain=DOMAIN,
+            version=2,
+            title=f"Ulica Testowa {index}, Miasto",
+            unique_id=f"{1000 + index}-{2000 + index}-{index}",
+            data=_address(index),
+            options=options,
+        )
+        for index in range(count)
+    ]
+
+
+class SimulatedClock:
+    """Shifts Home Assistant's clock, leaving the event loop's alone.
+
+    Outages start and end and the far-term tier comes due as the simulated
+    period passes, while timeouts and the loop lag keep measuring real time.
+    """
+
+    def __init__(self) -> None:
+        self._offset = timedelta()
+        self._now = dt_util.now
+        self._utcnow = dt_util.utcnow
+
+    def advance(self, delta: timedelta) -> None:
+        self._offset += delta
+
+    def __enter__(self) -> SimulatedClock:
+        dt_util.now = lambda time_zone=None: self._now(time_zone) + self._offset
+        dt_util.utcnow = lambda: self._utcnow() + self._offset
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        dt_util.now = self._now
+        dt_util.utcnow = self._utcnow
+
+
+class LoopLagMonitor:
+    """Measures how late a short sleep wakes up."""
+
+    def __init__(self) -> None:
+        self.samples: list[float] = []
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(LAG_INTERVAL)
+            self.samples.append(max(time.perf_counter() - started - LAG_INTERVAL, 0.0))
+
+    def summary(self) -> dict[str, float]:
+        if not self.samples:
+            return {"p50_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+        ordered = sorted(self.samples)
+        return {
+            "p50_ms": round(statistics.median(ordered) * 1000, 2),
+            "p99_ms": round(ordered[min(int(len(ordered) * 0.99), len(ordered) - 1)] * 1000, 2),
+            "max_ms": round(ordered[-1] * 1000, 2),
+        }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _peak_rss_mb() -> float:
+    # Linux reports kilobytes, macOS bytes.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+async def _async_setup_entries(
+    hass: HomeAssistant, entries: list[MockConfigEntry]
+) -> dict[str, float]:
+    """Set the integration up with every entry, as startup does, and time it.
+
+    async_setup_entry includes the platforms, which are also timed on their own.
+    """
+    forward = hass.config_entries.async_forward_entry_setups
+    setup_entry = integration.async_setup_entry
+    platform_times: list[float] = []
+    entry_times: list[float] = []
+
+    async def _timed_forward(entry: Any, platforms: Any) -> None:
+        started = time.perf_counter()
+        await forward(entry, platforms)
+        platform_times.append(time.perf_counter() - started)
+
+    async def _timed_setup_entry(hass: HomeAssistant, entry: Any) -> bool:
+        started = time.perf_counter()
+        result = await setup_entry(hass, entry)
+        entry_times.append(time.perf_counter() - started)
+        return result
+
+    hass.config_entries.async_forward_entry_setups = _timed_forward  # type: ignore[method-assign]
+    integration.async_setup_entry = _timed_setup_entry
+    started = time.perf_counter()
+    try:
+        if not await async_setup_component(hass, DOMAIN, {}):
+            raise RuntimeError(f"Setting up {DOMAIN} failed")
+        await hass.async_block_till_done()
+    finally:
+        del hass.config_entries.async_forward_entry_setups
+        integration.async_setup_entry = setup_entry
+    failed = [entry.title for entry in entries if entry.state is not ConfigEntryState.LOADED]
+    if failed:
+        raise RuntimeError(f"{len(failed)} entries failed to set up, e.g. {failed[0]}")
+    return {
+        "total_s": round(time.perf_counter() - started, 3),
+        "entry_mean_ms": round(statistics.fmean(entry_times) * 1000, 2),
+        "entry_max_ms": round(max(entry_times) * 1000, 2),
+        "platforms_mean_ms": round(statistics.fmean(platform_times) * 1000, 2),
+        "platforms_max_ms": round(max(platform_times) * 1000, 2),
+    }
+
+
+async def _async_run(args: argparse.Namespace) -> dict[str, Any]:
+    fake: FakeTauronApi | None = None
+    replay: ReplaySession | None = None
+    if args.replay:
+        replay = ReplaySession(load_capture(args.replay))
+    else:
+        fake = FakeTauronApi(args.outages, args.churn, args.seed)
+        tauron_api.API_BASE_URL = await fake.async_start()
+    source = replay or fake
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        os.symlink(
+            os.path.join(ROOT, "custom_components"),
+            os.path.join(config_dir, "custom_components"),
+        )
+        async with async_test_home_assistant(config_dir=config_dir) as hass:
+            # Let the loader pick up custom_components from the config dir.
+            hass.data.pop(loader.DATA_CUSTOM_COMPONENTS, None)
+            await async_setup_component(
+                hass, "http", {"http": {"server_host": "127.0.0.1", "server_port": _free_port()}}
+            )
+            if replay is not None:
+                http = async_get_session(hass)
+                await http.session.close()
+                http.session = replay  # type: ignore[assignment]
+
+            entries = _entries(
+                args.entries, args.scan_interval, args.parse_threshold, args.hub
+            )
+            for entry in entries:
+                entry.add_to_hass(hass)
+
+            lag = LoopLagMonitor()
+            lag.start()
+            setup = await _async_setup_entries(hass, entries)
+            setup_requests = source.requests
+
+            writes = 0
+
+            @callback
+            def _count_write(_event: Event) -> None:
+                nonlocal writes
+                writes += 1
+
+            @callback
+            def _any(_data: Any) -> bool:
+                return True
+
+            # A write that changes nothing but the timestamp is "reported".
+            unsubs = [
+                hass.bus.async_listen(EVENT_STATE_CHANGED, _count_write),
+                hass.bus.async_listen(EVENT_STATE_REPORTED, _count_write, _any),
+            ]
+
+            # Each tick moves the clock on by one polling interval and
+            # refreshes every entry at the same moment - the worst case, as
+            # the real timers are spread out by jitter. A hub refreshes its
+            # addresses itself.
+            coordinators = [entry.runtime_data for entry in entries]
+            addresses = list(hass.data[DOMAIN].values())
+            interval = timedelta(minutes=args.scan_interval)
+            ticks = max(int(args.hours * 60 / args.scan_interval), 1)
+            refresh_loop_times: list[float] = []
+            started = time.perf_counter()
+            with SimulatedClock() as clock:
+                for _ in range(ticks):
+                    clock.advance(interval)
+                    await asyncio.gather(
+                        *(coordinator.async_refresh() for coordinator in coordinators)
+                    )
+                    await hass.async_block_till_done()
+                    refresh_loop_times.extend(
+                        address.last_loop_time
+                        for address in addresses
+                        if address.last_loop_time is not None
+                    )
+            elapsed = time.perf_counter() - started
+
+            for unsub in unsubs:
+                unsub()
+            await lag.stop()
+            for entry in entries:
+                await hass.config_entries.async_unload(entry.entry_id)
+            await hass.async_block_till_done()
+
+    if fake is not None:
+        await fake.async_stop()
+    requests = source.requests - setup_requests
+    return {
+        "entries": args.entries,
+        "hub": args.hub,
+        "simulated_hours": args.hours,
+        "refresh_ticks": ticks,
+        "wall_s": round(elapsed, 3),
+        "setup": setup,
+        "loop_lag": lag.summary(),
+        "refresh_loop": {
+            "mean_ms": round(statistics.fmean(refresh_loop_times) * 1000, 3),
+            "max_ms": round(max(refresh_loop_times) * 1000, 3),
+        },
+        "peak_rss_mb": _peak_rss_mb(),
+        "state_writes": writes,
+        "state_writes_per_s": round(writes / elapsed, 1),
+        "api_requests": requests,
+        "api_requests_per_s": round(requests / elapsed, 1),
+    }
+
+
+def _failures(args: argparse.Namespace, result: dict[str, Any]) -> list[str]:
+    checks = (
+        (args.max_loop_lag_ms, result["loop_lag"]["max_ms"], "max loop lag (ms)"),
+        (args.max_setup_s, result["setup"]["total_s"], "setup time (s)"),
+        (args.max_rss_mb, result["peak_rss_mb"], "peak RSS (MB)"),
+        (args.max_writes_per_s, result["state_writes_per_s"], "state writes per second"),
+        (args.max_requests, result["api_requests"], "API requests"),
+    )
+    return [
+        f"{label} {value} exceeds {limit}"
+        for limit, value, label in checks
+        if limit is not None and value > limit
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--entries", type=int, default=100, help="config entries (default 100)")
+    parser.add_argument(
+        "--hub", action="store_true", help="hold every address in one hub entry"
+    )
+    parser.add_argument("--hours", type=float, default=6, help="simulated period (default 6)")
+    parser.add_argument(
+        "--scan-interval",
+        type=int,
+        default=MIN_SCAN_INTERVAL,
+        help=f"polling interval in minutes (default {MIN_SCAN_INTERVAL})",
+    )
+    parser.add_argument("--outages", type=int, default=8, help="outages per address (default 8)")
+    parser.add_argument(
+        "--churn", type=float, default=0.05, help="chance an outage moves per poll (default 0.05)"
+    )
+    parser.add_argument(
+        "--parse-threshold",
+        type=int,
+        default=DEFAULT_PARSE_THRESHOLD,
+        help=(
+            "outages above which parsing moves to the executor "
+            f"(default {DEFAULT_PARSE_THRESHOLD})"
+        ),
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--replay",
+        metavar="FILE",
+        help="serve a capture from the export_capture action instead of the fake",
+    )
+    parser.add_argument("--max-loop-lag-ms", type=float)
+    parser.add_argument("--max-setup-s", type=float)
+    parser.add_argument("--max-rss-mb", type=float)
+    parser.add_argument("--max-writes-per-s", type=float)
+    parser.add_argument(
+        "--max-requests", type=int, help="API requests over the simulated period"
+    )
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    result = asyncio.run(_async_run(args))
+    failures = _failures(args, result)
+
+    if args.json:
+        print(json.dumps({**result, "failures": failures}, indent=2))
+    else:
+        setup = result["setup"]
+        lag = result["loop_lag"]
+        refresh_loop = result["refresh_loop"]
+        print(f"entries            {result['entries']}{' in one hub' if result['hub'] else ''}")
+        print(
+            f"simulated          {result['simulated_hours']} h, "
+            f"{result['refresh_ticks']} polls, {result['wall_s']} s wall"
+        )
+        print(
+            f"setup              {setup['total_s']} s total, "
+            f"entry mean {setup['entry_mean_ms']} ms / max {setup['entry_max_ms']} ms"
+        )
+        print(
+            f"platforms          mean {setup['platforms_mean_ms']} ms / "
+            f"max {setup['platforms_max_ms']} ms"
+        )
+        print(
+            f"loop lag           p50 {lag['p50_ms']} ms / p99 {lag['p99_ms']} ms / "
+            f"max {lag['max_ms']} ms"
+        )
+        print(
+            f"refresh loop time  mean {refresh_loop['mean_ms']} ms / "
+            f"max {refresh_loop['max_ms']} ms"
+        )
+        print(f"peak RSS           {result['peak_rss_mb']} MB")
+        print(f"state writes       {result['state_writes']} ({result['state_writes_per_s']}/s)")
+        print(f"API requests       {result['api_requests']} ({result['api_requests_per_s']}/s)")
+        for failure in failures:
+            print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())